@@ -2,18 +2,36 @@
 
 from pathlib import Path
 
-from ._head_spec import HeadSpec, dumps, loads
+from ._head_spec import (
+    HeadSpec,
+    clear_render_cache,
+    dump,
+    dumps,
+    iter_loads,
+    loads,
+    render_cache_info,
+    set_render_cache_size,
+)
+from ._head_store import HeadStore
 
 PACK_FOLDER = Path("Head Hunter")
+CACHE_FOLDER = Path(".cache")
 HEAD_TRADE_FILENAME = "add_trade.mcfunction"
 BLOCK_TRADE_FILENAME = "add_block_trade.mcfunction"
 
 
 __all__ = [
     "HeadSpec",
+    "HeadStore",
+    "dump",
     "dumps",
+    "iter_loads",
     "loads",
+    "render_cache_info",
+    "clear_render_cache",
+    "set_render_cache_size",
     "PACK_FOLDER",
+    "CACHE_FOLDER",
     "HEAD_TRADE_FILENAME",
     "BLOCK_TRADE_FILENAME",
 ]
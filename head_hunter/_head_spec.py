@@ -1,7 +1,12 @@
 """Functionality for abstracting and serializing player heads"""
 
+import ast
+import functools
 import re
-from typing import Iterable, NamedTuple
+from typing import IO, TYPE_CHECKING, Any, Generator, Iterable, NamedTuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .resolve import TextureResolver
 
 _RARITY_COLORS = (
     ("common", "white"),
@@ -10,6 +15,23 @@ _RARITY_COLORS = (
     ("epic", "magenta"),
 )
 
+_V41_COMPONENTS = ("item_name", "profile", "rarity", "note_block_sound")
+
+# how each component's key is spelled in a `/give` command vs. in a trade list
+_V41_KEYS: dict[bool, dict[str, str]] = {
+    False: {component: f"minecraft:{component}=" for component in _V41_COMPONENTS},
+    True: {component: f'"minecraft:{component}":' for component in _V41_COMPONENTS},
+}
+
+# a single `key=value` pair from the spec line written by `HeadSpec.dumps()`
+_SPEC_ITEM = re.compile(
+    r"\s*([A-Za-z_]\w*)="
+    r"""('[^'\\]*(?:\\.[^'\\]*)*'|"[^"\\]*(?:\\.[^"\\]*)*"|True|False|None|1|0)"""
+    r"\s*(?:,|$)"
+)
+_SPEC_CONSTANTS = {"True": True, "False": False, "None": None, "1": True, "0": False}
+_FLAG_FIELDS = ("italic", "bold", "underlined", "strikethrough", "obfuscated")
+
 
 class HeadSpec(NamedTuple):
     """Specification of a player head
@@ -126,11 +148,19 @@ class HeadSpec(NamedTuple):
                 if key not in ("name", "comment") and value
             )
         )
+        if not spec and len(writeme) == 2 and _SPEC_START.match(self.name):
+            # make sure the name won't be read back as a spec line
+            spec = "texture=None"
         if spec:
             writeme.append(spec)
         return "\n".join(writeme)
 
-    def to_player_head(self, pack_format: int = 48, offline: bool = False) -> str:
+    def to_player_head(
+        self,
+        pack_format: int = 48,
+        offline: bool = False,
+        resolver: "TextureResolver | None" = None,
+    ) -> str:
         """Generate the player head specification for use in commands and older
         versions of the game
 
@@ -147,6 +177,12 @@ class HeadSpec(NamedTuple):
             dynamically or—worse—failing to fetch at all in-game). If you're
             running this on a computer without internet access (or just want the
             short version of the serialized head spec), pass in `offline=True`.
+            Lookups are cached on disk between runs
+            (see: `head_hunter.mojang.SkinCache`).
+        resolver : TextureResolver, optional
+            Where to look up the current texture from, if one is needed. If None
+            is provided, the texture will be fetched from the Mojang API.
+            See: `head_hunter.resolve`
 
         Returns
         -------
@@ -166,21 +202,19 @@ class HeadSpec(NamedTuple):
           `pack_format < 41`, but for modern versions of the game,
           `HeadSpec.to_component_dict()` is the method to generate the
           specification for use in a trade list.
+        - Rendered specifications are memoized, so re-rendering an unchanged
+          head is cheap (see: `set_render_cache_size()`).
         """
-        texture_override: str | None = None
-        if self.texture is None and self.player_name and not offline:
-            from head_hunter import mojang
-
-            texture_override = mojang.get_players_current_skin(self.player_name)
-        if pack_format >= 41:
-            return self._to_v41(texture=texture_override)
-        if pack_format >= 15:
-            return self._to_v15(texture=texture_override)
-        if pack_format >= 4:
-            return self._to_v4(texture=texture_override)
-        raise NotImplementedError(f"Data pack version {pack_format} is not supported.")
+        return _render(
+            _normalize_flags(self),
+            pack_format,
+            self._current_texture(offline, resolver),
+            False,
+        )
 
-    def to_component_dict(self, offline: bool = False) -> str:
+    def to_component_dict(
+        self, offline: bool = False, resolver: "TextureResolver | None" = None
+    ) -> str:
         """Generate the player head specification for use in trade lists for
         modern versions of the game (Minecraft 1.21 and above)
 
@@ -193,6 +227,12 @@ class HeadSpec(NamedTuple):
             dynamically or—worse—failing to fetch at all in-game). If you're
             running this on a computer without internet access (or just want the
             short version of the serialized head spec), pass in `offline=True`.
+            Lookups are cached on disk between runs
+            (see: `head_hunter.mojang.SkinCache`).
+        resolver : TextureResolver, optional
+            Where to look up the current texture from, if one is needed. If None
+            is provided, the texture will be fetched from the Mojang API.
+            See: `head_hunter.resolve`
 
         Returns
         -------
@@ -206,22 +246,30 @@ class HeadSpec(NamedTuple):
         41 and above). For older datapacks, use
         `HeadSpec.to_player_head(pack_format=desired_pack_format)`
         """
-        head_spec = self.to_player_head(offline=offline)
-        for component in (
-            "item_name",
-            "profile",
-            "properties",
-            "rarity",
-            "note_block_sound",
-        ):
-            head_spec = head_spec.replace(
-                f"minecraft:{component}=", f'"minecraft:{component}":'
-            )
-        return head_spec
+        return _render(
+            _normalize_flags(self), 48, self._current_texture(offline, resolver), True
+        )
+
+    def _current_texture(
+        self, offline: bool, resolver: "TextureResolver | None"
+    ) -> str | None:
+        """Look up the texture to use in place of the player's name, if
+        one is needed"""
+        if self.texture is not None or not self.player_name or offline:
+            return None
+        if resolver is None:
+            from head_hunter import mojang
+
+            return mojang.get_players_current_skin(self.player_name)
+        return resolver.get_texture(self.player_name)
 
-    def _to_v41(self, texture: str | None = None) -> str:
+    def _to_v41(
+        self, texture: str | None = None, as_component_dict: bool = False
+    ) -> str:
+        keys = _V41_KEYS[as_component_dict]
         components: list[str] = [
-            "minecraft:item_name='"
+            keys["item_name"]
+            + "'"
             + _format_text(
                 self.name,
                 color=self.color,
@@ -236,11 +284,11 @@ class HeadSpec(NamedTuple):
         if profile_spec := _format_profile_v41(
             self.player_name, texture or self.texture
         ):
-            components.append(f"minecraft:profile={profile_spec}")
+            components.append(keys["profile"] + profile_spec)
         if self.rarity:
-            components.append(f'minecraft:rarity="{self.rarity}"')
+            components.append(f'{keys["rarity"]}"{self.rarity}"')
         if self.note_block_sound:
-            components.append(f'minecraft:note_block_sound="{self.note_block_sound}"')
+            components.append(f'{keys["note_block_sound"]}"{self.note_block_sound}"')
 
         # TODO
         # if self.lore:
@@ -312,6 +360,24 @@ def dumps(heads: Iterable[HeadSpec]) -> str:
     return "\n\n".join([head.dumps() for head in heads])
 
 
+def dump(heads: Iterable[HeadSpec], fp: IO[str]) -> None:
+    """Serialize a list of HeadSpecs straight to file, one head at a time (so
+    that arbitrarily long streams of heads can be written in constant memory)
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec
+        The heads to serialize
+    fp : file
+        The (text-mode) file to write to. The output will be identical to
+        the output of `dumps()`.
+    """
+    separator = ""
+    for head in heads:
+        fp.write(separator + head.dumps())
+        separator = "\n\n"
+
+
 def loads(head_list: str | bytes) -> list[HeadSpec]:
     """Deserialize a list of HeadSpecs written by `dumps()`
 
@@ -328,17 +394,190 @@ def loads(head_list: str | bytes) -> list[HeadSpec]:
     """
     if isinstance(head_list, bytes):
         head_list = head_list.decode("utf-8")
-    heads: list[HeadSpec] = []
-    for head in head_list.split("\n\n"):
-        lines = head.splitlines()
-        if len(lines) == 1:
-            heads.append(HeadSpec.from_username(lines[0]))
+    return [_parse_head(head.splitlines()) for head in head_list.split("\n\n")]
+
+
+def iter_loads(fp: IO) -> Generator[HeadSpec, None, None]:
+    """Deserialize HeadSpecs written by `dumps()` (or `dump()`), reading from
+    file one head at a time (so that arbitrarily long head lists can be read in
+    constant memory)
+
+    Parameters
+    ----------
+    fp : file
+        The file to read from, opened in either text or binary mode (in which
+        case the contents are assumed to be UTF-8 encoded)
+
+    Yields
+    ------
+    HeadSpec
+        Each deserialized head spec, in order
+
+    Raises
+    ------
+    ValueError
+        If a head spec could not be parsed
+    """
+    lines: list[str] = []
+    for line in fp:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line := line.rstrip("\r\n"):
+            lines.append(line)
+        elif lines:
+            yield _parse_head(lines)
+            lines = []
+    if lines:
+        yield _parse_head(lines)
+
+
+# how a spec line starts: with one of the fields a spec line can set (so that
+# a display name that merely contains an "=" isn't mistaken for one)
+_SPEC_START = re.compile(
+    r"\s*(?:"
+    + "|".join(field for field in HeadSpec._fields if field not in ("name", "comment"))
+    + ")="
+)
+
+
+def _parse_head(lines: list[str]) -> HeadSpec:
+    """Deserialize a single head spec written by `HeadSpec.dumps()`
+
+    Parameters
+    ----------
+    lines : list of str
+        The 1-3 lines specifying the head
+
+    Returns
+    -------
+    HeadSpec
+        The deserialized head spec
+
+    Raises
+    ------
+    ValueError
+        If the lines could not be parsed
+    """
+    match lines:
+        case [username]:
+            return HeadSpec.from_username(username)
+        case [name, spec]:
+            if _SPEC_START.match(spec) is None:
+                # a commented head with nothing else to specify
+                return HeadSpec(spec, comment=name)
+            return HeadSpec(name, **_parse_spec(spec))
+        case [comment, name, spec]:
+            return HeadSpec(name, **_parse_spec(spec), comment=comment)
+    raise ValueError("Could not parse head spec:\n" + "\n".join(lines))
+
+
+def _parse_spec(spec: str) -> dict[str, Any]:
+    """Parse the `key='value', key=True` line written by `HeadSpec.dumps()`
+    without evaluating it
+
+    Parameters
+    ----------
+    spec : str
+        The spec line
+
+    Returns
+    -------
+    dict
+        The parsed fields
+
+    Raises
+    ------
+    ValueError
+        If the spec line could not be parsed or contains a field that
+        isn't part of a `HeadSpec`
+    """
+    parsed: dict[str, Any] = {}
+    position = 0
+    while position < len(spec):
+        if (matched := _SPEC_ITEM.match(spec, position)) is None:
+            raise ValueError(f"Could not parse head spec:\n{spec}")
+        key, value = matched.groups()
+        if key not in HeadSpec._fields or key in ("name", "comment"):
+            raise ValueError(f"{key} is not a valid field for a head spec")
+        if value in _SPEC_CONSTANTS:
+            parsed[key] = _SPEC_CONSTANTS[value]
+        elif "\\" in value:
+            parsed[key] = ast.literal_eval(value)
         else:
-            to_eval = f"name={repr(lines[-2])}, {lines[-1]}"
-            if len(lines) == 3:
-                to_eval += f", comment={repr(lines[0])}"
-            heads.append(HeadSpec(**eval(f"dict({to_eval})")))
-    return heads
+            # no escapes, so we can just strip the quotes
+            parsed[key] = value[1:-1]
+        position = matched.end()
+    return parsed
+
+
+def _render_uncached(
+    head: HeadSpec, pack_format: int, texture: str | None, as_component_dict: bool
+) -> str:
+    """Render a head spec for the given pack format, overriding its texture
+    (see: `HeadSpec.to_player_head()` and `HeadSpec.to_component_dict()`)"""
+    if as_component_dict or pack_format >= 41:
+        return head._to_v41(texture=texture, as_component_dict=as_component_dict)
+    if pack_format >= 15:
+        return head._to_v15(texture=texture)
+    if pack_format >= 4:
+        return head._to_v4(texture=texture)
+    raise NotImplementedError(f"Data pack version {pack_format} is not supported.")
+
+
+def _normalize_flags(head: HeadSpec) -> HeadSpec:
+    """Coerce a head spec's formatting flags to bools, so that equivalent
+    specs (e.g. `italic=1` and `italic=True`) render identically and share
+    a single render cache entry"""
+    if all(type(getattr(head, flag)) is bool for flag in _FLAG_FIELDS):
+        return head
+    return head._replace(
+        italic=bool(head.italic),
+        bold=bool(head.bold),
+        underlined=bool(head.underlined),
+        strikethrough=bool(head.strikethrough),
+        obfuscated=bool(head.obfuscated),
+    )
+
+
+RENDER_CACHE_SIZE = 4096
+
+_render = functools.lru_cache(maxsize=RENDER_CACHE_SIZE)(_render_uncached)
+
+
+def set_render_cache_size(maxsize: int | None) -> None:
+    """Change the number of rendered head specs that are remembered (so that
+    re-rendering an unchanged head for the same pack format is just a lookup)
+
+    Parameters
+    ----------
+    maxsize : int or None
+        The maximum number of rendered head specs to keep, with the least
+        recently used ones being evicted first. Pass in 0 to disable the cache
+        or None to let it grow without bound.
+
+    Notes
+    -----
+    Changing the size clears the cache
+    """
+    global _render
+    _render = functools.lru_cache(maxsize=maxsize)(_render_uncached)
+
+
+def render_cache_info() -> functools._CacheInfo:
+    """Get the hit / miss statistics of the render cache
+
+    Returns
+    -------
+    CacheInfo
+        The number of hits and misses since the cache was last cleared, along
+        with its maximum and current size
+    """
+    return _render.cache_info()
+
+
+def clear_render_cache() -> None:
+    """Forget every rendered head spec (and reset the cache statistics)"""
+    _render.cache_clear()
 
 
 def _format_text(text: str, **formatters) -> str:
@@ -0,0 +1,174 @@
+"""Compact storage for very large collections of head specs"""
+
+from array import array
+from typing import Any, Callable, Iterable, Iterator, Sequence, overload
+
+from ._head_spec import HeadSpec
+
+_STRING_FIELDS = (
+    "name",
+    "player_name",
+    "note_block_sound",
+    "rarity",
+    "color",
+    "comment",
+)
+_FLAG_FIELDS = ("italic", "bold", "underlined", "strikethrough", "obfuscated")
+
+
+class _StringTable:
+    """Append-only table of unique strings, referenced by integer ID (with 0
+    reserved for None)"""
+
+    def __init__(self) -> None:
+        self.values: list[str | None] = [None]
+        self.ids: dict[str | None, int] = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.values) - 1
+
+    def intern(self, value: str | None) -> int:
+        try:
+            return self.ids[value]
+        except KeyError:
+            self.ids[value] = len(self.values)
+            self.values.append(value)
+            return self.ids[value]
+
+
+class HeadStore(Sequence[HeadSpec]):
+    """A list-like container of head specs that stores each field in its own
+    compact column, with every distinct string (and, separately, every distinct
+    texture) stored only once
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec, optional
+        The heads to store
+
+    Notes
+    -----
+    - Heads are stored by value, so iterating over (or indexing into) a
+      `HeadStore` will generate new `HeadSpec` objects that are equal to (but
+      not the same objects as) the ones that were added.
+    - Strings and textures are never removed from the tables once they've been
+      added, so a store that has been heavily filtered may be holding on to
+      data it no longer needs (slices and filtered stores share their parent's
+      tables). Use `HeadStore(old_store)` to compact it.
+    """
+
+    def __init__(self, heads: Iterable[HeadSpec] = ()):
+        self._strings = _StringTable()
+        self._textures = _StringTable()
+        self._columns: dict[str, array] = {
+            field: array("I") for field in (*_STRING_FIELDS, "texture")
+        }
+        self._flags = array("B")
+        self.extend(heads)
+
+    @property
+    def unique_strings(self) -> int:
+        """The number of distinct strings (names, comments, sounds...) stored"""
+        return len(self._strings)
+
+    @property
+    def unique_textures(self) -> int:
+        """The number of distinct textures stored"""
+        return len(self._textures)
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    @overload
+    def __getitem__(self, index: int) -> HeadSpec: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "HeadStore": ...
+
+    def __getitem__(self, index: int | slice) -> "HeadSpec | HeadStore":
+        if isinstance(index, slice):
+            return self._take(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("HeadStore index out of range")
+        fields: dict[str, Any] = {
+            field: self._strings.values[self._columns[field][index]]
+            for field in _STRING_FIELDS
+        }
+        fields["texture"] = self._textures.values[self._columns["texture"][index]]
+        flags = self._flags[index]
+        for bit, field in enumerate(_FLAG_FIELDS):
+            fields[field] = bool(flags & (1 << bit))
+        return HeadSpec(**fields)
+
+    def __iter__(self) -> Iterator[HeadSpec]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return (
+            f"HeadStore(<{len(self)} heads, {self.unique_strings} strings,"
+            f" {self.unique_textures} textures>)"
+        )
+
+    def append(self, head: HeadSpec) -> None:
+        """Add a head to the end of the store
+
+        Parameters
+        ----------
+        head : HeadSpec
+            The head to add
+        """
+        for field in _STRING_FIELDS:
+            self._columns[field].append(self._strings.intern(getattr(head, field)))
+        self._columns["texture"].append(self._textures.intern(head.texture))
+        self._flags.append(
+            sum(
+                1 << bit
+                for bit, field in enumerate(_FLAG_FIELDS)
+                if getattr(head, field)
+            )
+        )
+
+    def extend(self, heads: Iterable[HeadSpec]) -> None:
+        """Add several heads to the end of the store
+
+        Parameters
+        ----------
+        heads : list-like of HeadSpec
+            The heads to add
+        """
+        if heads is self:
+            heads = list(heads)  # don't iterate over a list while extending it
+        for head in heads:
+            self.append(head)
+
+    def filter(self, predicate: Callable[[HeadSpec], bool]) -> "HeadStore":
+        """Select the heads matching some condition
+
+        Parameters
+        ----------
+        predicate : function
+            A function that takes in a `HeadSpec` and returns True if that
+            head should be kept
+
+        Returns
+        -------
+        HeadStore
+            A new store containing only the matching heads, in their
+            original order
+        """
+        return self._take([index for index, head in enumerate(self) if predicate(head)])
+
+    def _take(self, indices: Iterable[int]) -> "HeadStore":
+        """Create a new store from the heads at the specified positions,
+        sharing this store's string and texture tables"""
+        taken = HeadStore()
+        taken._strings = self._strings
+        taken._textures = self._textures
+        for index in indices:
+            for field, column in self._columns.items():
+                taken._columns[field].append(column[index])
+            taken._flags.append(self._flags[index])
+        return taken
@@ -0,0 +1,355 @@
+"""An indexed binary format for head lists that supports random access
+without having to read (or parse) the whole file
+
+The layout of the file (all integers little-endian) is:
+
+1. A fixed-size header (see `_HEADER`) giving the number of heads and strings
+   and the offsets of each of the sections below
+2. The head records: one fixed-size record (see `_RECORD`) per head,
+   consisting of the ID of each of its string fields (with 0 meaning None)
+   followed by a bitmask of its formatting flags
+3. The string offsets: `string_count + 1` 64-bit offsets into the string blob
+   (string `i` spans offsets `i - 1` through `i`)
+4. The string blob: every distinct string (names, textures, comments...)
+   encoded as UTF-8, stored once
+5. The name and comment indices: open-addressing hash tables, each slot holding
+   the CRC-32 of a name (or comment) and the position (plus one) of a head
+   with that name (or comment)
+"""
+
+import mmap
+import struct
+import zlib
+from os import PathLike
+from types import TracebackType
+from typing import Any, Iterable, Iterator, Sequence, overload
+
+from . import HeadSpec, dump, iter_loads
+
+MAGIC = b"HHBL"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIQQQQIQI")
+_RECORD = struct.Struct("<7IB")
+_OFFSET = struct.Struct("<Q")
+_SLOT = struct.Struct("<II")
+
+_STRING_FIELDS = (
+    "name",
+    "player_name",
+    "texture",
+    "note_block_sound",
+    "rarity",
+    "color",
+    "comment",
+)
+_FLAG_FIELDS = ("italic", "bold", "underlined", "strikethrough", "obfuscated")
+
+
+def write_binary(heads: Iterable[HeadSpec], binary_path: str | PathLike) -> int:
+    """Write a list of HeadSpecs to file in the indexed binary format
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec
+        The heads to write
+    binary_path : path
+        Where to save the file. Any existing file at this location will be
+        overwritten.
+
+    Returns
+    -------
+    int
+        The number of heads written
+
+    Raises
+    ------
+    PermissionError
+        If you don't have the ability to write to the specified path
+    """
+    string_ids: dict[str, int] = {}
+    records = bytearray()
+    names: list[str | None] = []
+    comments: list[str | None] = []
+
+    for head in heads:
+        ids: list[int] = []
+        for field in _STRING_FIELDS:
+            value = getattr(head, field)
+            if value is None:
+                ids.append(0)
+            else:
+                ids.append(string_ids.setdefault(value, len(string_ids) + 1))
+        flags = sum(
+            1 << bit for bit, field in enumerate(_FLAG_FIELDS) if getattr(head, field)
+        )
+        records += _RECORD.pack(*ids, flags)
+        names.append(head.name)
+        comments.append(head.comment)
+
+    string_offsets = bytearray(_OFFSET.pack(0))
+    blob = bytearray()
+    for string in string_ids:  # dicts preserve insertion order, so this is by ID
+        blob += string.encode("utf-8")
+        string_offsets += _OFFSET.pack(len(blob))
+
+    name_index = _build_index(names)
+    comment_index = _build_index(comments)
+
+    records_offset = _HEADER.size
+    string_offsets_offset = records_offset + len(records)
+    strings_offset = string_offsets_offset + len(string_offsets)
+    name_index_offset = strings_offset + len(blob)
+    comment_index_offset = name_index_offset + len(name_index)
+
+    with open(binary_path, "wb") as binary_file:
+        binary_file.write(
+            _HEADER.pack(
+                MAGIC,
+                VERSION,
+                _RECORD.size,
+                len(names),
+                len(string_ids),
+                records_offset,
+                string_offsets_offset,
+                strings_offset,
+                name_index_offset,
+                len(name_index) // _SLOT.size,
+                comment_index_offset,
+                len(comment_index) // _SLOT.size,
+            )
+        )
+        for section in (records, string_offsets, blob, name_index, comment_index):
+            binary_file.write(section)
+
+    return len(names)
+
+
+def _build_index(keys: list[str | None]) -> bytearray:
+    """Build an open-addressing hash table mapping each (non-None) key to the
+    position(s) where it occurs"""
+    slot_count = 1
+    while slot_count < 2 * len(keys):
+        slot_count *= 2
+    slots = bytearray(slot_count * _SLOT.size)
+    for position, key in enumerate(keys):
+        if key is None:
+            continue
+        key_hash = _hash(key)
+        slot = key_hash & (slot_count - 1)
+        while _SLOT.unpack_from(slots, slot * _SLOT.size)[1]:
+            slot = (slot + 1) & (slot_count - 1)
+        _SLOT.pack_into(slots, slot * _SLOT.size, key_hash, position + 1)
+    return slots
+
+
+def _hash(key: str) -> int:
+    """A hash that (unlike the builtin) is stable across sessions"""
+    return zlib.crc32(key.encode("utf-8"))
+
+
+class BinaryHeadList(Sequence[HeadSpec]):
+    """Read-only, memory-mapped view of a head list written by `write_binary()`
+
+    Parameters
+    ----------
+    binary_path : path
+        The file to open
+
+    Raises
+    ------
+    FileNotFoundError
+        If the specified file doesn't exist
+    ValueError
+        If the specified file is not a binary head list (or is a version
+        this package doesn't know how to read)
+
+    Notes
+    -----
+    - Opening the file only reads the header: heads are decoded from the
+      memory map on demand, so looking up any one head (by position, name or
+      comment) takes constant time no matter how big the list is.
+    - Use this as a context manager (or call `close()`) to release the
+      underlying file.
+    """
+
+    def __init__(self, binary_path: str | PathLike):
+        with open(binary_path, "rb") as binary_file:
+            self._map = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                version,
+                record_size,
+                self._head_count,
+                self._string_count,
+                self._records_offset,
+                self._string_offsets_offset,
+                self._strings_offset,
+                self._name_index_offset,
+                self._name_index_size,
+                self._comment_index_offset,
+                self._comment_index_size,
+            ) = _HEADER.unpack_from(self._map, 0)
+        except struct.error as too_short:
+            self._map.close()
+            raise ValueError(f"{binary_path} is not a binary head list") from too_short
+        if magic != MAGIC or record_size != _RECORD.size:
+            self._map.close()
+            raise ValueError(f"{binary_path} is not a binary head list")
+        if version != VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported binary head list version: {version}")
+
+    def __enter__(self) -> "BinaryHeadList":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying file"""
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._head_count
+
+    @overload
+    def __getitem__(self, index: int) -> HeadSpec: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[HeadSpec]: ...
+
+    def __getitem__(self, index: int | slice) -> HeadSpec | list[HeadSpec]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BinaryHeadList index out of range")
+        *ids, flags = _RECORD.unpack_from(
+            self._map, self._records_offset + index * _RECORD.size
+        )
+        fields: dict[str, Any] = {
+            field: self._string(string_id)
+            for field, string_id in zip(_STRING_FIELDS, ids)
+        }
+        for bit, field in enumerate(_FLAG_FIELDS):
+            fields[field] = bool(flags & (1 << bit))
+        return HeadSpec(**fields)
+
+    def __iter__(self) -> Iterator[HeadSpec]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def find(self, name: str | None = None, comment: str | None = None) -> list[int]:
+        """Look up the positions of heads by name and / or comment
+
+        Parameters
+        ----------
+        name : str, optional
+            The (exact) display name to search for
+        comment : str, optional
+            The (exact) comment to search for
+
+        Returns
+        -------
+        list of int
+            The positions of every head matching all of the given criteria,
+            in order
+
+        Raises
+        ------
+        ValueError
+            If neither a name nor a comment is provided
+        """
+        matches: set[int] | None = None
+        for field, key, index_offset, index_size in (
+            ("name", name, self._name_index_offset, self._name_index_size),
+            ("comment", comment, self._comment_index_offset, self._comment_index_size),
+        ):
+            if key is None:
+                continue
+            found = {
+                position
+                for position in self._probe(index_offset, index_size, key)
+                if getattr(self[position], field) == key
+            }
+            matches = found if matches is None else matches & found
+        if matches is None:
+            raise ValueError("Must provide a name and / or comment to search for")
+        return sorted(matches)
+
+    def _probe(self, index_offset: int, index_size: int, key: str) -> Iterator[int]:
+        """Yield the positions of every head whose key has the same hash as the
+        one provided"""
+        key_hash = _hash(key)
+        slot = key_hash & (index_size - 1)
+        while True:
+            slot_hash, position = _SLOT.unpack_from(
+                self._map, index_offset + slot * _SLOT.size
+            )
+            if not position:
+                return
+            if slot_hash == key_hash:
+                yield position - 1
+            slot = (slot + 1) & (index_size - 1)
+
+    def _string(self, string_id: int) -> str | None:
+        if string_id == 0:
+            return None
+        start, end = struct.unpack_from(
+            "<QQ", self._map, self._string_offsets_offset + (string_id - 1) * 8
+        )
+        return str(
+            self._map[self._strings_offset + start : self._strings_offset + end],
+            "utf-8",
+        )
+
+
+def text_to_binary(text_path: str | PathLike, binary_path: str | PathLike) -> int:
+    """Convert a head list written by `head_hunter.dump()` (or `dumps()`) into
+    the indexed binary format
+
+    Parameters
+    ----------
+    text_path : path
+        The head list to convert
+    binary_path : path
+        Where to save the converted list
+
+    Returns
+    -------
+    int
+        The number of heads converted
+    """
+    with open(text_path, encoding="utf-8") as text_file:
+        return write_binary(iter_loads(text_file), binary_path)
+
+
+def binary_to_text(binary_path: str | PathLike, text_path: str | PathLike) -> int:
+    """Convert a binary head list back into the format written by
+    `head_hunter.dump()`
+
+    Parameters
+    ----------
+    binary_path : path
+        The binary head list to convert
+    text_path : path
+        Where to save the converted list
+
+    Returns
+    -------
+    int
+        The number of heads converted
+    """
+    with BinaryHeadList(binary_path) as heads, open(
+        text_path, "w", encoding="utf-8"
+    ) as text_file:
+        dump(heads, text_file)
+        return len(heads)
@@ -0,0 +1,157 @@
+"""Utilities for finding (and getting rid of) heads that share the same skin"""
+
+import base64
+import binascii
+import json
+from typing import Generator, Iterable
+
+from . import HeadSpec
+
+TEXTURE_URL_ROOT = "http://textures.minecraft.net/texture/"
+
+
+def _decode_texture(texture: str) -> dict:
+    """Decode a base64-encoded texture into its JSON payload
+
+    Raises
+    ------
+    ValueError
+        If the texture is not valid base64-encoded JSON
+    """
+    try:
+        # padding is frequently omitted
+        payload = base64.b64decode(texture + "=" * (-len(texture) % 4))
+        return json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as bad_texture:
+        raise ValueError(f"Could not decode texture {texture}") from bad_texture
+
+
+def skin_hash(texture: str) -> str:
+    """Extract the hash identifying the skin from a texture
+
+    Parameters
+    ----------
+    texture : str
+        The skin, encoded in base64 (as found in `HeadSpec.texture`)
+
+    Returns
+    -------
+    str
+        The hash at the end of the skin's URL, which will be the same for
+        every texture of that skin, no matter when (or for whom) the texture
+        was generated
+
+    Raises
+    ------
+    ValueError
+        If the texture can't be decoded or doesn't specify a skin
+    """
+    try:
+        url = _decode_texture(texture)["textures"]["SKIN"]["url"]
+    except (KeyError, TypeError) as no_skin:
+        raise ValueError(f"Texture does not specify a skin: {texture}") from no_skin
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def normalize_texture(texture: str) -> str:
+    """Re-encode a texture in a canonical (and minimal) form, dropping
+    everything but the skin itself (timestamps, profile names, etc.)
+
+    Parameters
+    ----------
+    texture : str
+        The skin, encoded in base64
+
+    Returns
+    -------
+    str
+        The canonical encoding of that skin. Two textures of the same skin
+        will have the same canonical encoding.
+
+    Raises
+    ------
+    ValueError
+        If the texture can't be decoded or doesn't specify a skin
+    """
+    skin: dict = {"url": TEXTURE_URL_ROOT + skin_hash(texture)}
+    if metadata := _decode_texture(texture)["textures"]["SKIN"].get("metadata"):
+        skin["metadata"] = metadata
+    return base64.b64encode(
+        json.dumps({"textures": {"SKIN": skin}}, separators=(",", ":")).encode()
+    ).decode()
+
+
+def _skin_key(head: HeadSpec) -> str | None:
+    """Get the key identifying the skin a head will display (or None if the
+    head doesn't specify a skin at all)"""
+    if head.texture:
+        try:
+            return skin_hash(head.texture)
+        except ValueError:
+            # can't tell what's in it, so only exact matches count
+            return head.texture
+    if head.player_name:
+        return "player:" + head.player_name.lower()
+    return None
+
+
+def find_duplicates(heads: Iterable[HeadSpec]) -> dict[str, list[int]]:
+    """Find all heads sharing the same skin
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec
+        The heads to check (such as the output of
+        `head_hunter.parse.parse_wandering_trades()`)
+
+    Returns
+    -------
+    dict of str to list of int
+        The positions of the heads sharing each duplicated skin, keyed by
+        the skin's hash (or, for heads specified only by player name,
+        "player:" followed by the lowercased username)
+
+    Notes
+    -----
+    Heads with the same skin but different names, formatting or note block
+    sounds still count as duplicates
+    """
+    groups: dict[str, list[int]] = {}
+    for position, head in enumerate(heads):
+        if (key := _skin_key(head)) is not None:
+            groups.setdefault(key, []).append(position)
+    return {key: positions for key, positions in groups.items() if len(positions) > 1}
+
+
+def deduplicate(
+    heads: Iterable[HeadSpec], normalize_textures: bool = False
+) -> Generator[HeadSpec, None, None]:
+    """Collapse heads sharing the same skin, keeping only the first of each
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec
+        The heads to deduplicate
+    normalize_textures : bool, optional
+        If True, the texture of each head that's kept will also be replaced
+        with its canonical encoding (see: `normalize_texture()`), which is
+        generally much shorter. Default is False.
+
+    Yields
+    ------
+    HeadSpec
+        The first head with each distinct skin, in order (heads that don't
+        specify a skin at all are passed through as-is)
+    """
+    seen: set[str] = set()
+    for head in heads:
+        if (key := _skin_key(head)) is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        if normalize_textures and head.texture:
+            try:
+                head = head._replace(texture=normalize_texture(head.texture))
+            except ValueError:
+                pass
+        yield head
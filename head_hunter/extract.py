@@ -1,18 +1,383 @@
 """Utilities for loading a particular file from inside a zipped data pack"""
 
+import atexit
+import filecmp
 import fnmatch
 import os
 import shutil
+import threading
 import warnings
-from contextlib import contextmanager
+import zlib
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from os import PathLike
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import IO, Generator, Iterable
-from zipfile import BadZipFile, ZipFile
+from typing import IO, Generator, Iterable, NamedTuple
+from zipfile import BadZipFile, ZipFile, ZipInfo
 
-from . import PACK_FOLDER
-from .write import patch_block_trade_provider_function
+from . import PACK_FOLDER, parse_cache
+from .write import _function_dir, patch_block_trade_provider_function
+
+
+class PackInfo(NamedTuple):
+    """A data pack found in a pack directory
+
+    Attributes
+    ----------
+    path : Path
+        The path to the data pack
+    normalized_name : str
+        The pack's file name, normalized for matching (lowercase, without
+        spaces, dashes or underscores)
+    is_zipped : bool
+        Whether the data pack is a zip file (as opposed to a folder)
+    size : int
+        The size of the pack file (or folder entry), in bytes
+    mtime : int
+        The pack file's modification time, in nanoseconds since the epoch
+    """
+
+    path: Path
+    normalized_name: str
+    is_zipped: bool
+    size: int
+    mtime: int
+
+
+class PackIndex:
+    """Index of the data packs inside of a pack directory, so that finding a
+    pack (or a file within a pack) doesn't require opening every pack
+
+    Parameters
+    ----------
+    pack_directory : path, optional
+        The pack directory to index. If None is given, this will index the
+        "packs" folder inside the current working directory.
+
+    Notes
+    -----
+    - Every lookup re-checks the directory listing and the size and
+      modification time of each entry, so packs that have been added,
+      removed or replaced are always picked up, but only packs that have
+      changed are re-examined.
+    - The file listing of a zipped pack is only read the first time a file
+      is looked up inside of it (and again only once the pack changes).
+    - A single index can be safely shared across threads.
+    """
+
+    def __init__(self, pack_directory: str | PathLike | None = None):
+        self.pack_directory = Path(
+            "packs" if pack_directory is None else pack_directory
+        )
+        self._packs: dict[str, PackInfo] = {}
+        self._members: dict[str, frozenset[str]] = {}
+        self._rejected: dict[str, tuple[int, int]] = {}
+        self._sorted: list[PackInfo] = []
+        self._lock = threading.Lock()
+
+    def refresh(self) -> list[PackInfo]:
+        """Bring the index up to date with the contents of the pack directory
+
+        Returns
+        -------
+        list of PackInfo
+            The available data packs, sorted lexically (alphabetically)
+        """
+        with self._lock:
+            packs: dict[str, PackInfo] = {}
+            rejected = self._rejected
+            try:
+                entries = list(os.scandir(self.pack_directory))
+            except (FileNotFoundError, NotADirectoryError):
+                entries = []
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # e.g. a broken symlink
+                    continue
+                stats = (stat.st_size, stat.st_mtime_ns)
+                info = self._packs.get(entry.name)
+                if info is None or (info.size, info.mtime) != stats:
+                    self._members.pop(entry.name, None)
+                    if entry.is_dir():
+                        rejected.pop(entry.name, None)
+                    elif rejected.get(entry.name) == stats:
+                        continue
+                    path = self.pack_directory / entry.name
+                    if not _is_valid_data_pack(path):
+                        rejected[entry.name] = stats
+                        continue
+                    info = PackInfo(
+                        path,
+                        _normalize_file_name(entry.name),
+                        not entry.is_dir(),
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                    )
+                elif not info.is_zipped and not _is_valid_data_pack(info.path):
+                    # a folder's pack.mcmeta can be removed without the
+                    # folder's own stats changing
+                    continue
+                packs[entry.name] = info
+            for name in self._members.keys() - packs.keys():
+                del self._members[name]
+            listed = {entry.name for entry in entries}
+            for name in rejected.keys() - listed:
+                del rejected[name]
+            if packs != self._packs:
+                self._packs = packs
+                self._sorted = [packs[name] for name in sorted(packs)]
+            return list(self._sorted)
+
+    def get(self, pack_name: str) -> PackInfo:
+        """Get a specific data pack
+
+        Parameters
+        ----------
+        pack_name : str
+            Which data pack you want (not case-sensitive, and after normalizing
+            for spaces, underscores and dashes)
+
+        Returns
+        -------
+        PackInfo
+            The matching data pack. If there are multiple packs matching the
+            given description, the one returned should hopefully be the
+            _most recent_ one (it'll be the last one sorted lexically).
+
+        Raises
+        ------
+        KeyError
+            If no matching packs can be found
+        RuntimeWarning
+            If there are multiple packs matching the given specification
+        """
+        pack_pattern = _normalize_file_name(pack_name) + "*"
+        matches = [
+            info
+            for info in self.refresh()
+            if fnmatch.fnmatchcase(info.normalized_name, pack_pattern)
+        ]
+
+        if len(matches) == 0:
+            raise KeyError(f"Could not find a pack matching {pack_pattern}")
+        if len(matches) > 1:
+            message = f"Multiple packs match {pack_pattern}:"
+            for pack in matches:
+                message += f"\n - {pack.path}"
+            message += f"\n\nExtracting: {matches[-1].path}"
+            warnings.warn(message, RuntimeWarning)
+
+        return matches[-1]
+
+    def find(
+        self,
+        pack_name: str,
+        resource: str | PathLike | Iterable[str | PathLike],
+    ) -> tuple[Path, str]:
+        """Locate a specific file within a data pack
+
+        Parameters
+        ----------
+        pack_name : str
+            Which data pack you want (see: `get()`)
+        resource : path or list of paths
+            The specific resource you want to find, specified as a Path
+            relative to the pack root. If there are multiple locations this
+            resource could be, provide them as a list, and this method will
+            check each in order until one is found.
+
+        Returns
+        -------
+        Path
+            The path to the data pack
+        str
+            The location of the resource within that pack (as a "/"-delimited
+            path relative to the pack root)
+
+        Raises
+        ------
+        KeyError
+            If the pack or pack file cannot be found
+        """
+        if isinstance(resource, (str, PathLike)):
+            locations = [resource]
+        else:
+            locations = list(resource)
+        pack = self.get(pack_name)
+        if pack.is_zipped:
+            members = self._list_members(pack)
+            for location in locations:
+                if (member := Path(location).as_posix()) in members:
+                    return pack.path, member
+        else:
+            for location in locations:
+                if (pack.path / location).is_file():
+                    return pack.path, Path(location).as_posix()
+        raise KeyError(
+            "Could not find the requested resource in any of the provided locations."
+            "\nChecked:\n" + "\n".join((f" - {location}" for location in locations))
+        )
+
+    def _list_members(self, pack: PackInfo) -> frozenset[str]:
+        """Get (and remember) the names of all the files in a zipped pack"""
+        name = pack.path.name
+        with self._lock:
+            if (members := self._members.get(name)) is not None:
+                return members
+        members = frozenset(list_pack_files(pack.path))
+        with self._lock:
+            if self._packs.get(name) == pack:
+                self._members[name] = members
+        return members
+
+
+class _PooledZip:
+    """An open zip file, along with what's needed to know when to close it"""
+
+    def __init__(self, zipped: ZipFile, stats: tuple[int, int]):
+        self.zipped = zipped
+        self.stats = stats
+        self.users = 0
+        self.retired = False
+
+
+class _ZipPool:
+    """Bounded pool of open zip files, so that reading many files out of the
+    same pack doesn't mean re-reading the pack's file listing each time
+
+    Parameters
+    ----------
+    max_open : int
+        The maximum number of zip files to keep open. Once this limit is
+        exceeded, the least recently used ones will be closed.
+
+    Notes
+    -----
+    - A zip file that's replaced on disk will be re-opened the next time
+      it's requested.
+    - Zip files that are evicted while in use are only closed once every
+      thread using them is done.
+    """
+
+    def __init__(self, max_open: int):
+        self.max_open = max_open
+        self._handles: OrderedDict[str, _PooledZip] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def open(self, zip_path: str | PathLike) -> Generator[ZipFile, None, None]:
+        """Borrow the open zip file at the given path, opening it if needed
+
+        Parameters
+        ----------
+        zip_path : path
+            The zip file to open
+
+        Yields
+        ------
+        ZipFile
+            The open zip file. This should not be closed by the caller.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the zip file doesn't exist
+        BadZipFile
+            If the file isn't a zip file
+        """
+        key = os.path.abspath(zip_path)
+        stat = os.stat(key)
+        stats = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None and handle.stats != stats:
+                self._retire(self._handles.pop(key))
+                handle = None
+            if handle is not None:
+                self._handles.move_to_end(key)
+                handle.users += 1
+        if handle is None:
+            handle = _PooledZip(ZipFile(key), stats)
+            handle.users = 1
+            with self._lock:
+                if (replaced := self._handles.pop(key, None)) is not None:
+                    self._retire(replaced)
+                self._handles[key] = handle
+                self._evict(self.max_open)
+        try:
+            yield handle.zipped
+        finally:
+            with self._lock:
+                handle.users -= 1
+                if handle.retired and handle.users == 0:
+                    handle.zipped.close()
+
+    def resize(self, max_open: int) -> None:
+        """Change the maximum number of zip files to keep open, closing any
+        that no longer fit"""
+        with self._lock:
+            self.max_open = max_open
+            self._evict(max_open)
+
+    def close(self) -> None:
+        """Close every zip file in the pool (any still in use will be closed
+        as soon as they're released)"""
+        with self._lock:
+            self._evict(0)
+
+    def _evict(self, max_open: int) -> None:
+        while len(self._handles) > max(max_open, 0):
+            self._retire(self._handles.popitem(last=False)[1])
+
+    @staticmethod
+    def _retire(handle: _PooledZip) -> None:
+        handle.retired = True
+        if handle.users == 0:
+            handle.zipped.close()
+
+
+_zip_pool = _ZipPool(max_open=16)
+atexit.register(_zip_pool.close)
+
+
+def set_zip_pool_size(max_open: int) -> None:
+    """Change the number of zipped data packs that are kept open between reads
+
+    Parameters
+    ----------
+    max_open : int
+        The maximum number of zip files to keep open, with the least recently
+        used ones being closed first. Pass in 0 to close each zip file as soon
+        as it's no longer being read.
+    """
+    _zip_pool.resize(max_open)
+
+
+_pack_indexes: dict[Path, PackIndex] = {}
+_pack_indexes_lock = threading.Lock()
+
+
+def get_pack_index(pack_directory: str | PathLike | None = None) -> PackIndex:
+    """Get the (shared) index for a pack directory
+
+    Parameters
+    ----------
+    pack_directory : path, optional
+        The pack directory. If None is given, this will return the index of
+        the "packs" folder inside the current working directory.
+
+    Returns
+    -------
+    PackIndex
+        The index for that pack directory
+    """
+    pack_directory = Path("packs" if pack_directory is None else pack_directory)
+    with _pack_indexes_lock:
+        if (index := _pack_indexes.get(pack_directory)) is None:
+            index = _pack_indexes[pack_directory] = PackIndex(pack_directory)
+    return index
 
 
 def list_available_packs(pack_directory: str | PathLike | None = None) -> list[Path]:
@@ -35,14 +400,7 @@ def list_available_packs(pack_directory: str | PathLike | None = None) -> list[P
     If the pack directory doesn't exist, this method will return an empty list
     rather than raising an error
     """
-    if pack_directory is None:
-        pack_directory = Path("packs")
-    if not isinstance(pack_directory, Path):
-        pack_directory = Path(pack_directory)
-
-    return sorted(
-        [file for file in pack_directory.iterdir() if _is_valid_data_pack(file)]
-    )
+    return [pack.path for pack in get_pack_index(pack_directory).refresh()]
 
 
 def get_data_pack(pack_name: str, pack_directory: str | PathLike | None = None) -> Path:
@@ -72,23 +430,44 @@ def get_data_pack(pack_name: str, pack_directory: str | PathLike | None = None)
     RuntimeWarning
         If there are multiple packs matching the given specification
     """
-    pack_pattern = _normalize_file_name(pack_name) + "*"
-    matches: list[Path] = [
-        file
-        for file in list_available_packs(pack_directory)
-        if fnmatch.fnmatchcase(_normalize_file_name(file.name), pack_pattern)
-    ]
+    return get_pack_index(pack_directory).get(pack_name).path
 
-    if len(matches) == 0:
-        raise KeyError(f"Could not find a pack matching {pack_pattern}")
-    if len(matches) > 1:
-        message = f"Multiple packs match {pack_pattern}:"
-        for pack in matches:
-            message += f"\n - {pack}"
-        message += f"\n\nExtracting: {matches[-1]}"
-        warnings.warn(message, RuntimeWarning)
 
-    return matches[-1]
+def find_in_data_pack(
+    pack_name: str,
+    resource: str | PathLike | Iterable[str | PathLike],
+    pack_directory: str | PathLike | None = None,
+) -> tuple[Path, str]:
+    """Locate a specific file within a data pack
+
+    Parameters
+    ----------
+    pack_name : str
+        Which data pack you want (not case-sensitive, and after normalizing
+        for spaces, underscores and dashes)
+    resource : path or list of paths
+        The specific resource you want to find, specified as a Path relative
+        to the pack root. If there are multiple locations this resource could be,
+        provide them as a list, and this method will check each in order until
+        one is found.
+    pack_directory : path, optional
+        The pack directory to search. If None is given, this method will look
+        for a "packs" folder inside the current working directory.
+
+    Returns
+    -------
+    Path
+        The path to the data pack
+    str
+        The location of the resource within that pack (as a "/"-delimited path
+        relative to the pack root)
+
+    Raises
+    ------
+    KeyError
+        If the pack or pack file cannot be found
+    """
+    return get_pack_index(pack_directory).find(pack_name, resource)
 
 
 @contextmanager
@@ -123,36 +502,170 @@ def file_from_data_pack(
     KeyError
         If the pack or pack file cannot be found
     """
-    if isinstance(resource, (str, PathLike)):
-        locations = [resource]
+    pack_root, location = find_in_data_pack(pack_name, resource, pack_directory)
+    if pack_root.is_dir():
+        with (pack_root / location).open() as pack_file:
+            yield pack_file
     else:
-        locations = list(resource)
-    pack_root = get_data_pack(pack_name, pack_directory)
-    for location in locations:
-        if pack_root.is_dir():
-            try:
-                with (pack_root / location).open() as pack_file:
-                    yield pack_file
-                    break
-            except FileNotFoundError:
-                continue
-        else:
-            try:
-                with ZipFile(pack_root).open(str(location)) as pack_file:
-                    yield pack_file
-                    break
-            except KeyError:
-                continue
+        with open_pack_file(pack_root, location) as pack_file:
+            yield pack_file
+
+
+@contextmanager
+def open_pack_file(
+    pack_root: str | PathLike, location: str
+) -> Generator[IO, None, None]:
+    """Open a file inside of a data pack (in binary mode)
+
+    Parameters
+    ----------
+    pack_root : path
+        The data pack (zipped or not)
+    location : str
+        The location of the file within that pack (as a "/"-delimited path
+        relative to the pack root), such as one returned by
+        `find_in_data_pack()`
+
+    Yields
+    -------
+    file
+        file pointer open to the requested file
+
+    Raises
+    ------
+    KeyError
+        If the file doesn't exist in the pack
+    """
+    pack_root = Path(pack_root)
+    if pack_root.is_dir():
+        try:
+            loose_file = (pack_root / location).open("rb")
+        except FileNotFoundError as not_found:
+            raise KeyError(f"{location} does not exist in {pack_root}") from not_found
+        with loose_file:
+            yield loose_file
+    else:
+        with _zip_pool.open(pack_root) as zipped, zipped.open(location) as zipped_file:
+            yield zipped_file
+
+
+def list_pack_files(pack_root: str | PathLike) -> list[str]:
+    """List every file inside of a data pack
+
+    Parameters
+    ----------
+    pack_root : path
+        The data pack (zipped or not)
+
+    Returns
+    -------
+    list of str
+        The location of each file within the pack (as a "/"-delimited path
+        relative to the pack root, the same way they'd be listed in a zip file)
+
+    Raises
+    ------
+    FileNotFoundError
+        If the pack doesn't exist
+    """
+    pack_root = Path(pack_root)
+    if pack_root.is_dir():
+        return [
+            path.relative_to(pack_root).as_posix()
+            for path in pack_root.rglob("*")
+            if path.is_file()
+        ]
+    with _zip_pool.open(pack_root) as zipped:
+        return [name for name in zipped.namelist() if not name.endswith("/")]
+
+
+def files_from_data_pack(
+    pack_name: str,
+    resources: Iterable[str | PathLike],
+    pack_directory: str | PathLike | None = None,
+) -> Generator[tuple[str, IO], None, None]:
+    """Open a bunch of files from the same data pack, one after another, without
+    re-opening the pack for each one
+
+    Parameters
+    ----------
+    pack_name : str
+        Which data pack you want (not case-sensitive, and after normalizing
+        for spaces, underscores and dashes)
+    resources : list of paths
+        The resources you want, each specified as a Path relative to the pack
+        root
+    pack_directory : path, optional
+        The pack directory to search. If None is given, this method will look
+        for a "packs" folder inside the current working directory.
+
+    Yields
+    ------
+    str
+        The location of the resource within the pack (as a "/"-delimited path
+        relative to the pack root)
+    file
+        file pointer open (in binary mode) to that resource. Each file is
+        closed once the next one is requested.
+
+    Raises
+    ------
+    KeyError
+        If the pack or any of the requested files cannot be found (this is
+        checked before any files are opened)
+    """
+    index = get_pack_index(pack_directory)
+    pack = index.get(pack_name)
+    locations = [Path(resource).as_posix() for resource in resources]
+    if pack.is_zipped:
+        members = index._list_members(pack)
+        missing = [location for location in locations if location not in members]
     else:
+        missing = [
+            location for location in locations if not (pack.path / location).is_file()
+        ]
+    if missing:
         raise KeyError(
-            "Could not find the requested resource in any of the provided locations."
-            "\nChecked:\n" + "\n".join((f" - {location}" for location in locations))
+            f"Could not find the following resources in {pack.path}:\n"
+            + "\n".join((f" - {location}" for location in missing))
         )
 
+    if not pack.is_zipped:
+        for location in locations:
+            with (pack.path / location).open("rb") as pack_file:
+                yield location, pack_file
+        return
+    with _zip_pool.open(pack.path) as zipped:
+        for location in locations:
+            with zipped.open(location) as pack_file:
+                yield location, pack_file
+
+
+class DataSync(NamedTuple):
+    """What changed when copying the "data" folder from an existing pack
+
+    Attributes
+    ----------
+    copied : list of str
+        The files that were added or overwritten
+    deleted : list of str
+        The files that were removed because the donor pack doesn't have them
+    unchanged : int
+        The number of files that were already up to date
+
+    Notes
+    -----
+    Files are specified as "/"-delimited paths relative to the pack root
+    """
+
+    copied: list[str]
+    deleted: list[str]
+    unchanged: int
+
 
 def copy_data_from_existing_pack(
-    pack_path: str | PathLike | None = None,
-) -> None:
+    pack_path: str | PathLike | None = None, incremental: bool = True
+) -> DataSync:
     """Copy the "data" folder from an existing pack into the default pack folder,
     overwriting any existing data directory
 
@@ -162,49 +675,154 @@ def copy_data_from_existing_pack(
         The pack to copy from. If None is provided, this method will look
         for a "wandering trades" data pack in the "packs" folder ("hermit edition"
         packs should be given priority).
+    incremental : bool, optional
+        By default, only files that are new or that differ from the ones
+        already in the pack folder are copied (comparing CRCs and sizes for
+        zipped packs and file contents otherwise). Pass in `incremental=False`
+        to re-copy every file regardless.
+
+    Returns
+    -------
+    DataSync
+        Which files were copied and deleted
 
     Raises
     ------
     KeyError
         If the specified pack path does not exist or has no data folder
+
+    Notes
+    -----
+    Either way, the pack folder's "data" directory will end up matching the
+    donor's (files the donor doesn't have are deleted). If anything goes
+    wrong partway through, every change is rolled back.
     """
     if pack_path is None:
-        return copy_data_from_existing_pack(get_data_pack("wandering trades"))
+        return copy_data_from_existing_pack(
+            get_data_pack("wandering trades"), incremental
+        )
 
     donor_root = Path(pack_path).resolve()
     if not donor_root.exists():
         raise KeyError(f"{donor_root} does not exist")
 
+    data_folder = PACK_FOLDER / "data"
+    data_root = data_folder.resolve()
+    existing = {
+        path.relative_to(PACK_FOLDER).as_posix()
+        for path in data_folder.rglob("*")
+        if path.is_file()
+    }
+    copied: list[str] = []
+    deleted: list[str] = []
+    unchanged = 0
+
     with TemporaryDirectory() as tmpdir:
-        try:
-            shutil.move(str(PACK_FOLDER / "data"), os.path.join(tmpdir, "data"))
-            move_back = True
-        except FileNotFoundError:
-            move_back = False
-        try:
-            if donor_root.is_dir():
-                shutil.copytree(
-                    donor_root / "data",
-                    PACK_FOLDER / "data",
-                    ignore=None,
-                )
+        # anything that gets overwritten or deleted is moved here first so
+        # that it can be put back if something goes wrong
+        backup_folder = Path(tmpdir)
+        backed_up: list[str] = []
+
+        def back_up(location: str, keep: bool = False) -> None:
+            (backup_folder / location).parent.mkdir(parents=True, exist_ok=True)
+            if keep:  # for files that are about to be modified in place
+                shutil.copy2(PACK_FOLDER / location, backup_folder / location)
             else:
-                zipped = ZipFile(donor_root)
-                zipped.extractall(
-                    PACK_FOLDER,
-                    [
-                        file
-                        for file in zipped.namelist()
-                        if file.startswith(f"data{os.sep}")
-                    ],
-                )
-            patch_block_trade_provider_function()
-
-        except Exception as fail:
-            if move_back:
-                shutil.rmtree(PACK_FOLDER / "data", ignore_errors=True)
-                shutil.move(os.path.join(tmpdir, "data"), PACK_FOLDER / "data")
-            raise fail
+                shutil.move(PACK_FOLDER / location, backup_folder / location)
+            backed_up.append(location)
+
+        try:
+            with ExitStack() as stack:
+                if donor_is_folder := donor_root.is_dir():
+                    donor_files = [
+                        location
+                        for location in list_pack_files(donor_root)
+                        if location.startswith("data/")
+                    ]
+                else:
+                    zipped = stack.enter_context(_zip_pool.open(donor_root))
+                    donor_files = [
+                        info.filename
+                        for info in zipped.infolist()
+                        if info.filename.startswith("data/") and not info.is_dir()
+                    ]
+                if not donor_files:
+                    raise KeyError(f"{donor_root} has no data folder")
+
+                for location in sorted(donor_files):
+                    destination = PACK_FOLDER / location
+                    # don't trust member names to stay inside the data folder
+                    # (e.g. "data/../x" or, on Windows, "data/..\\x")
+                    if not destination.resolve().is_relative_to(data_root):
+                        raise ValueError(
+                            f"{donor_root} contains unsafe path {location}"
+                        )
+                    if location in existing:
+                        if incremental and (
+                            filecmp.cmp(donor_root / location, destination)
+                            if donor_is_folder
+                            else _matches_zip_member(
+                                destination, zipped.getinfo(location)
+                            )
+                        ):
+                            unchanged += 1
+                            continue
+                        back_up(location)
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    copied.append(location)
+                    if donor_is_folder:
+                        shutil.copy2(donor_root / location, destination)
+                    else:
+                        with zipped.open(location) as source, destination.open(
+                            "wb"
+                        ) as copy:
+                            shutil.copyfileobj(source, copy)
+
+            for location in sorted(existing.difference(donor_files)):
+                back_up(location)
+                deleted.append(location)
+            if deleted:
+                _remove_empty_folders(data_folder)
+
+            provider_path = _function_dir() / "provide_block_trades.mcfunction"
+            provider = provider_path.relative_to(PACK_FOLDER).as_posix()
+            if provider not in copied and provider_path.exists():
+                back_up(provider, keep=True)
+            patch_block_trade_provider_function(provider_path)
+
+        except Exception:
+            for location in copied:
+                (PACK_FOLDER / location).unlink(missing_ok=True)
+            for location in backed_up:
+                (PACK_FOLDER / location).parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(backup_folder / location, PACK_FOLDER / location)
+            if data_folder.exists():
+                _remove_empty_folders(data_folder)
+            raise
+
+    return DataSync(copied, deleted, unchanged)
+
+
+def _matches_zip_member(file_path: Path, info: ZipInfo) -> bool:
+    """Check whether a file has the same contents as a file inside a zip (by
+    comparing sizes and, if those match, CRCs)"""
+    if file_path.stat().st_size != info.file_size:
+        return False
+    crc = 0
+    with file_path.open("rb") as file:
+        while chunk := file.read(1 << 16):
+            crc = zlib.crc32(chunk, crc)
+    return crc == info.CRC
+
+
+def _remove_empty_folders(folder: Path) -> None:
+    """Delete every empty folder inside of (but not including) the given
+    folder"""
+    for subfolder in sorted(
+        (path for path in folder.rglob("*") if path.is_dir()), reverse=True
+    ):
+        if not any(subfolder.iterdir()):
+            subfolder.rmdir()
 
 
 def _is_valid_data_pack(pack_path: Path) -> bool:
@@ -225,10 +843,19 @@ def _is_valid_data_pack(pack_path: Path) -> bool:
         return _is_valid_data_pack(pack_path.resolve())
     if pack_path.is_dir():
         return (pack_path / "pack.mcmeta").exists()
+    cache = parse_cache.get_cache()
     try:
-        return "pack.mcmeta" in ZipFile(pack_path).namelist()
-    except (BadZipFile, FileNotFoundError):
+        if cache is not None and (valid := cache.is_valid_pack(pack_path)) is not None:
+            return valid
+        with ZipFile(pack_path) as zipped:
+            valid = "pack.mcmeta" in zipped.namelist()
+    except FileNotFoundError:
         return False
+    except BadZipFile:
+        valid = False
+    if cache is not None:
+        cache.put_pack_validity(pack_path, valid)
+    return valid
 
 
 def _normalize_file_name(name: str) -> str:
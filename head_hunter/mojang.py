@@ -1,10 +1,39 @@
 """Functionality for interacting with the Mojang API"""
 
+import datetime as dt
+import random
+import sqlite3
+import threading
 import time
 import warnings
-from typing import Callable
+from concurrent.futures import Future
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, NamedTuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import CACHE_FOLDER
+
+API_ROOT = "https://api.mojang.com"
+SESSION_SERVER_ROOT = "https://sessionserver.mojang.com"
+SERVICES_ROOT = "https://api.minecraftservices.com"
+
+BULK_LOOKUP_LIMIT = 10
+
+TIMEOUT = 30.0
+
+# status codes that mean "try again later"
+_RETRY_STATUSES = (
+    requests.codes.too_many_requests,
+    requests.codes.internal_server_error,
+    requests.codes.bad_gateway,
+    requests.codes.service_unavailable,
+    requests.codes.gateway_timeout,
+)
 
 
 def _wrap_request_fail(api_call: Callable) -> Callable:
@@ -32,6 +61,11 @@ def _wrap_request_fail(api_call: Callable) -> Callable:
     return wrapped
 
 
+_RATE_LIMITED_MESSAGE = (
+    "Still getting rate limited by the Mojang API after retrying. Try again later?"
+)
+
+
 @_wrap_request_fail
 def _get_uuid_from_username(username: str) -> str:
     """Look up a player's UUID fromm their username
@@ -58,20 +92,56 @@ def _get_uuid_from_username(username: str) -> str:
     While this query is case-insensitive, this method does not check if the
     provided username is valid
     """
-    response = requests.get(
-        f"https://api.mojang.com/users/profiles/minecraft/{username}"
-    )
+    response = _request("GET", f"{API_ROOT}/users/profiles/minecraft/{username}")
     match response.status_code:
         case requests.codes.ok:
             return response.json()["id"]
         case requests.codes.not_found:
             raise ValueError(response.json()["errorMessage"])
         case requests.codes.too_many_requests:
-            warnings.warn(
-                "Getting rate limited. Sleeping for 10 seconds before trying again."
-            )
-            time.sleep(10)
-            return _get_uuid_from_username(username)
+            raise RuntimeError(_RATE_LIMITED_MESSAGE)
+        case _:
+            response.raise_for_status()
+    raise requests.RequestException()
+
+
+@_wrap_request_fail
+def _get_uuids_from_usernames(usernames: list[str]) -> dict[str, str]:
+    """Look up the UUIDs of several players at once
+
+    Parameters
+    ----------
+    usernames : list of str
+        The players' usernames. There can be no more than `BULK_LOOKUP_LIMIT`
+        names in a single request.
+
+    Returns
+    -------
+    dict of str to str
+        The UUIDs of each player that could be found, keyed by their
+        lowercased username. Players that could not be found will simply be
+        missing from this mapping.
+
+    Raises
+    ------
+    ValueError
+        If the request was rejected (for example, if too many usernames
+        were provided)
+    RuntimeError
+        If anything else goes wrong
+    """
+    response = _request(
+        "POST", f"{SERVICES_ROOT}/minecraft/profile/lookup/bulk/byname", json=usernames
+    )
+    match response.status_code:
+        case requests.codes.ok:
+            return {
+                profile["name"].lower(): profile["id"] for profile in response.json()
+            }
+        case requests.codes.bad_request:
+            raise ValueError(response.json()["errorMessage"])
+        case requests.codes.too_many_requests:
+            raise RuntimeError(_RATE_LIMITED_MESSAGE)
         case _:
             response.raise_for_status()
     raise requests.RequestException()
@@ -98,8 +168,8 @@ def _get_current_skin_from_uuid(uuid: str) -> str:
     RuntimeError
         If anything else goes wrong
     """
-    response = requests.get(
-        f"https://sessionserver.mojang.com/session/minecraft/profile/{uuid}"
+    response = _request(
+        "GET", f"{SESSION_SERVER_ROOT}/session/minecraft/profile/{uuid}"
     )
     match response.status_code:
         case requests.codes.ok:
@@ -111,23 +181,600 @@ def _get_current_skin_from_uuid(uuid: str) -> str:
         case requests.codes.no_content:
             raise ValueError(f"Couldn't find any profile with UUID {uuid}")
         case requests.codes.too_many_requests:
-            warnings.warn(
-                "Getting rate limited. Sleeping for 10 seconds before trying again."
-            )
-            time.sleep(10)
-            return _get_current_skin_from_uuid(uuid)
+            raise RuntimeError(_RATE_LIMITED_MESSAGE)
         case _:
             response.raise_for_status()
     raise requests.RequestException()
 
 
-def get_players_current_skin(username: str) -> str:
+class CacheStats(NamedTuple):
+    """Hit / miss counters for a `SkinCache`
+
+    Attributes
+    ----------
+    uuid_hits : int
+        The number of username lookups that were served from the cache
+    uuid_misses : int
+        The number of username lookups that had to go to the Mojang API
+    texture_hits : int
+        The number of skin lookups that were served from the cache
+    texture_misses : int
+        The number of skin lookups that had to go to the Mojang API
+    """
+
+    uuid_hits: int = 0
+    uuid_misses: int = 0
+    texture_hits: int = 0
+    texture_misses: int = 0
+
+
+class SkinCache:
+    """Persistent on-disk cache of Mojang API lookups, storing both
+    username→UUID and UUID→skin mappings
+
+    Parameters
+    ----------
+    cache_folder : path, optional
+        The folder in which to store the cache database. If None is given,
+        the cache will be stored in the package's `CACHE_FOLDER`.
+    uuid_ttl : timedelta, optional
+        How long a username→UUID lookup should be trusted for. Default is
+        30 days (usernames can be changed, but not often).
+    texture_ttl : timedelta, optional
+        How long a UUID→skin lookup should be trusted for. Default is one day.
+    max_entries : int, optional
+        The maximum number of entries to keep in each table. Once this limit
+        is exceeded, the least recently used entries will be evicted.
+        Default is 10,000.
+
+    Notes
+    -----
+    - Usernames are case-insensitive, so they are normalized to lowercase
+      before being stored or looked up.
+    - A single cache can be safely shared across threads.
+    """
+
+    FILENAME = "mojang.sqlite3"
+
+    def __init__(
+        self,
+        cache_folder: str | PathLike | None = None,
+        uuid_ttl: dt.timedelta = dt.timedelta(days=30),
+        texture_ttl: dt.timedelta = dt.timedelta(days=1),
+        max_entries: int = 10_000,
+    ):
+        self.path = Path(cache_folder or CACHE_FOLDER) / self.FILENAME
+        self.uuid_ttl = uuid_ttl
+        self.texture_ttl = texture_ttl
+        self.max_entries = max_entries
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            for table, key in (("uuids", "username"), ("textures", "uuid")):
+                self._db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"{key} TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                    " fetched REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+
+    @property
+    def stats(self) -> CacheStats:
+        """The hit / miss counters accumulated since this cache was opened
+        (or since the last time they were reset)"""
+        return self._stats
+
+    def reset_stats(self) -> None:
+        """Zero out the hit / miss counters"""
+        with self._lock:
+            self._stats = CacheStats()
+
+    def get_uuid(self, username: str) -> str | None:
+        """Look up a player's UUID from the cache
+
+        Parameters
+        ----------
+        username : str
+            A player's username
+
+        Returns
+        -------
+        str or None
+            The player's UUID, or None if it's not in the cache (or if the
+            cached value has expired)
+        """
+        with self._lock:
+            uuid = self._get("uuids", "username", username.lower(), self.uuid_ttl)
+            if uuid is None:
+                self._stats = self._stats._replace(
+                    uuid_misses=self._stats.uuid_misses + 1
+                )
+            else:
+                self._stats = self._stats._replace(uuid_hits=self._stats.uuid_hits + 1)
+        return uuid
+
+    def put_uuid(self, username: str, uuid: str) -> None:
+        """Store a player's UUID in the cache
+
+        Parameters
+        ----------
+        username : str
+            A player's username
+        uuid : str
+            That player's UUID
+        """
+        with self._lock:
+            self._put("uuids", "username", username.lower(), uuid)
+
+    def get_texture(self, uuid: str) -> str | None:
+        """Look up a player's skin from the cache
+
+        Parameters
+        ----------
+        uuid : str
+            The player's UUID
+
+        Returns
+        -------
+        str or None
+            The player's skin, encoded in base64, or None if it's not in the
+            cache (or if the cached value has expired)
+        """
+        with self._lock:
+            texture = self._get("textures", "uuid", uuid, self.texture_ttl)
+            if texture is None:
+                self._stats = self._stats._replace(
+                    texture_misses=self._stats.texture_misses + 1
+                )
+            else:
+                self._stats = self._stats._replace(
+                    texture_hits=self._stats.texture_hits + 1
+                )
+        return texture
+
+    def put_texture(self, uuid: str, texture: str) -> None:
+        """Store a player's skin in the cache
+
+        Parameters
+        ----------
+        uuid : str
+            The player's UUID
+        texture : str
+            The player's skin, encoded in base64
+        """
+        with self._lock:
+            self._put("textures", "uuid", uuid, texture)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM uuids")
+            self._db.execute("DELETE FROM textures")
+
+    def close(self) -> None:
+        """Close the connection to the cache database"""
+        self._db.close()
+
+    def _get(self, table: str, key: str, value: str, ttl: dt.timedelta) -> str | None:
+        now = time.time()
+        row = self._db.execute(
+            f"SELECT value, fetched FROM {table} WHERE {key} = ?", (value,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self._db:
+            if now - row[1] > ttl.total_seconds():
+                self._db.execute(f"DELETE FROM {table} WHERE {key} = ?", (value,))
+                return None
+            self._db.execute(
+                f"UPDATE {table} SET last_used = ? WHERE {key} = ?", (now, value)
+            )
+        return row[0]
+
+    def _put(self, table: str, key: str, value: str, cached: str) -> None:
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {table} ({key}, value, fetched, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (value, cached, now, now),
+            )
+            # LRU eviction
+            self._db.execute(
+                f"DELETE FROM {table} WHERE {key} IN ("
+                f"SELECT {key} FROM {table} ORDER BY last_used DESC"
+                " LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+class RateLimiter:
+    """Token-bucket rate limiter that can be shared across threads
+
+    Parameters
+    ----------
+    requests_per_second : float, optional
+        The sustained rate at which requests are allowed through. Default is
+        10 requests per second.
+    burst : int, optional
+        The number of requests that can go out back-to-back before the
+        sustained rate kicks in. Default is 10.
+    """
+
+    def __init__(self, requests_per_second: float = 10.0, burst: int = 10):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until the next request is allowed to go out
+
+        Returns
+        -------
+        float
+            The number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._last_refill) * self.requests_per_second,
+            )
+            self._last_refill = now
+            # reserving the token up front (even if that puts the bucket into
+            # debt) means that waiting threads get served in order
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.requests_per_second)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class RetryPolicy(NamedTuple):
+    """Policy for retrying requests to the Mojang API that failed because
+    of rate limiting (or some other temporary condition)
+
+    Attributes
+    ----------
+    max_attempts : int, optional
+        The maximum number of times to attempt a request (including the
+        initial attempt). Default is 5.
+    base_delay : float, optional
+        The number of seconds to wait before the first retry. The delay will
+        double for each subsequent retry. Default is 1 second.
+    max_delay : float, optional
+        The longest that will be waited between any two attempts (unless
+        the API says otherwise via a `Retry-After` header). Default is 60 seconds.
+    jitter : float, optional
+        The fraction by which each computed delay will be randomly shortened
+        (to keep concurrent requests from retrying in lockstep). Default is 0.5.
+    deadline : float or None, optional
+        The total number of seconds that can be spent on a single request,
+        including all retries. Default is 5 minutes. Pass in None to allow
+        for retrying indefinitely (until `max_attempts` is reached).
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+    jitter: float = 0.5
+    deadline: float | None = 300.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Calculate how long to wait before trying again
+
+        Parameters
+        ----------
+        attempt : int
+            The number of attempts that have been made so far
+        retry_after : float, optional
+            The number of seconds the API asked us to wait, if it said
+
+        Returns
+        -------
+        float
+            The number of seconds to wait
+        """
+        if retry_after is not None:
+            return max(0.0, retry_after)
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - random.uniform(0, self.jitter))
+
+
+class RequestStats(NamedTuple):
+    """Counters for the requests made to the Mojang API
+
+    Attributes
+    ----------
+    requests : int
+        The total number of requests sent (including retries)
+    retries : int
+        The number of those requests that were retries
+    seconds_waited : float
+        The total amount of time spent waiting, both on the rate limiter and
+        when backing off between retries
+    lookups_coalesced : int
+        The number of skin lookups that didn't need to be made at all because
+        they could share the result of an identical lookup
+        (see: `coalesce_lookups()`)
+    """
+
+    requests: int = 0
+    retries: int = 0
+    seconds_waited: float = 0.0
+    lookups_coalesced: int = 0
+
+
+_cache: SkinCache | None = None
+_caching_enabled = True
+_rate_limiter: RateLimiter | None = RateLimiter()
+_retry_policy = RetryPolicy()
+_session: requests.Session | None = None
+_request_stats = RequestStats()
+_lookups: dict[str, Future] = {}
+_coalescing_depth = 0
+_lock = threading.Lock()
+
+
+def get_cache() -> SkinCache | None:
+    """Get the cache used for Mojang API lookups, opening the default cache
+    if none has been set
+
+    Returns
+    -------
+    SkinCache or None
+        The cache currently in use, or None if caching has been disabled (or
+        if the default cache couldn't be opened, in which case caching will
+        be disabled with a warning)
+    """
+    global _cache, _caching_enabled
+    with _lock:
+        if _cache is None and _caching_enabled:
+            try:
+                _cache = SkinCache()
+            except (OSError, sqlite3.Error) as cache_fail:
+                warnings.warn(
+                    "Could not open the skin cache, so lookups will not be"
+                    f" cached:\n{cache_fail!r}",
+                    RuntimeWarning,
+                )
+                _caching_enabled = False
+    return _cache
+
+
+def set_cache(cache: SkinCache | None) -> None:
+    """Set the cache to use for Mojang API lookups
+
+    Parameters
+    ----------
+    cache : SkinCache or None
+        The cache to use. Pass in None to disable caching entirely.
+    """
+    global _cache, _caching_enabled
+    with _lock:
+        _cache = cache
+        _caching_enabled = cache is not None
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Get the rate limiter that all requests to the Mojang API go through
+
+    Returns
+    -------
+    RateLimiter or None
+        The rate limiter currently in use, or None if requests are not
+        being throttled
+    """
+    return _rate_limiter
+
+
+def set_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Set the rate limiter that all requests to the Mojang API go through
+
+    Parameters
+    ----------
+    rate_limiter : RateLimiter or None
+        The rate limiter to use. Pass in None to disable throttling entirely
+        (and rely on the Mojang API to tell you when to back off).
+    """
+    global _rate_limiter
+    _rate_limiter = rate_limiter
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the policy used for retrying requests to the Mojang API
+
+    Returns
+    -------
+    RetryPolicy
+        The retry policy currently in use
+    """
+    return _retry_policy
+
+
+def set_retry_policy(retry_policy: RetryPolicy) -> None:
+    """Set the policy used for retrying requests to the Mojang API
+
+    Parameters
+    ----------
+    retry_policy : RetryPolicy
+        The retry policy to use. To disable retrying entirely, pass in
+        `RetryPolicy(max_attempts=1)`.
+    """
+    global _retry_policy
+    _retry_policy = retry_policy
+
+
+def get_request_stats() -> RequestStats:
+    """Get the counters for requests made to the Mojang API since this module
+    was loaded (or since the last time they were reset)
+
+    Returns
+    -------
+    RequestStats
+        The request counters, including the total time spent waiting
+    """
+    return _request_stats
+
+
+def reset_request_stats() -> None:
+    """Zero out the request counters"""
+    global _request_stats
+    with _lock:
+        _request_stats = RequestStats()
+
+
+def _record(
+    sent: int = 0, retried: int = 0, waited: float = 0.0, coalesced: int = 0
+) -> None:
+    """Increment the request counters"""
+    global _request_stats
+    with _lock:
+        _request_stats = RequestStats(
+            _request_stats.requests + sent,
+            _request_stats.retries + retried,
+            _request_stats.seconds_waited + waited,
+            _request_stats.lookups_coalesced + coalesced,
+        )
+
+
+def _get_session() -> requests.Session:
+    """Get the (shared, keep-alive) session used for all requests to the
+    Mojang API, creating it if it doesn't exist yet"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            # leave plenty of room for concurrent rendering
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+    return _session
+
+
+def _throttle() -> float:
+    """Wait for the rate limiter (if there is one) to allow a request through,
+    returning the number of seconds spent waiting"""
+    if (rate_limiter := _rate_limiter) is not None:
+        return rate_limiter.acquire()
+    return 0.0
+
+
+def _parse_retry_after(retry_after: str | None) -> float | None:
+    """Convert the value of a `Retry-After` header (which can be either a number
+    of seconds or a date) into a number of seconds"""
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return (retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds()
+
+
+def _request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Make a request to the Mojang API, respecting the rate limiter and
+    backing off and retrying according to the retry policy
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method to use
+    url : str
+        The URL to request
+    **kwargs
+        Any additional arguments to pass to `requests.Session.request`
+
+    Returns
+    -------
+    Response
+        The API's response. If the request still couldn't get through once the
+        retry policy was exhausted, this will be the last response received.
+
+    Raises
+    ------
+    RequestException
+        If the request could not be made
+    """
+    policy = _retry_policy
+    session = _get_session()
+    kwargs.setdefault("timeout", TIMEOUT)
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        waited = _throttle()
+        response = session.request(method, url, **kwargs)
+        _record(sent=1, retried=attempt > 1, waited=waited)
+        if response.status_code not in _RETRY_STATUSES:
+            return response
+        if attempt >= policy.max_attempts:
+            return response
+        delay = policy.delay(
+            attempt, _parse_retry_after(response.headers.get("Retry-After"))
+        )
+        if (
+            policy.deadline is not None
+            and time.monotonic() - start + delay > policy.deadline
+        ):
+            return response
+        warnings.warn(
+            f"Mojang API responded with {response.status_code}."
+            f" Sleeping for {delay:.1f} seconds before trying again."
+        )
+        time.sleep(delay)
+        _record(waited=delay)
+
+
+@contextmanager
+def coalesce_lookups() -> Generator[None, None, None]:
+    """Context manager within which the result of every skin lookup is
+    remembered, so that looking up the same player again (even with different
+    capitalization) won't hit the cache or the Mojang API a second time
+
+    Notes
+    -----
+    - Outside of this context, simultaneous lookups of the same player (from
+      different threads) will still share a single request, but results will
+      be forgotten as soon as they're returned.
+    - Failed lookups are remembered too, so a player who can't be found will
+      only be searched for once.
+    - These contexts can be nested: results are only forgotten once the
+      outermost context exits.
+    """
+    global _coalescing_depth
+    with _lock:
+        _coalescing_depth += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _coalescing_depth -= 1
+            if _coalescing_depth == 0:
+                _lookups.clear()
+
+
+def get_players_current_skin(username: str, force_refresh: bool = False) -> str:
     """Grab a player's current skin
 
     Parameters
     ----------
     username : str
         A player's username
+    force_refresh : bool, optional
+        By default, lookups will be served from the cache (see: `get_cache()`)
+        whenever a fresh-enough entry is available, and identical lookups will
+        be coalesced (see: `coalesce_lookups()`). Pass in `force_refresh=True`
+        to always query the Mojang API (the cache will still be updated with
+        the results).
 
     Returns
     -------
@@ -146,5 +793,110 @@ def get_players_current_skin(username: str) -> str:
     While this query is case-insensitive, this method does not check if the
     provided username is valid
     """
-    uuid = _get_uuid_from_username(username)
-    return _get_current_skin_from_uuid(uuid)
+    if force_refresh:
+        return _fetch_players_current_skin(username, force_refresh=True)
+
+    key = username.lower()
+    with _lock:
+        leader = key not in _lookups
+        if leader:
+            _lookups[key] = Future()
+        lookup = _lookups[key]
+
+    if not leader:
+        _record(coalesced=1)
+        return lookup.result()
+
+    try:
+        lookup.set_result(_fetch_players_current_skin(username))
+    except BaseException as lookup_fail:
+        lookup.set_exception(lookup_fail)
+    finally:
+        with _lock:
+            if _coalescing_depth == 0:
+                _lookups.pop(key, None)
+    return lookup.result()
+
+
+def _fetch_players_current_skin(username: str, force_refresh: bool = False) -> str:
+    """Actually look up a player's current skin, without any coalescing
+    (see: `get_players_current_skin()` for the parameters)"""
+    cache = get_cache()
+
+    uuid = None if cache is None or force_refresh else cache.get_uuid(username)
+    if uuid is None:
+        uuid = _get_uuid_from_username(username)
+        if cache is not None:
+            cache.put_uuid(username, uuid)
+
+    texture = None if cache is None or force_refresh else cache.get_texture(uuid)
+    if texture is None:
+        texture = _get_current_skin_from_uuid(uuid)
+        if cache is not None:
+            cache.put_texture(uuid, texture)
+    return texture
+
+
+def resolve_uuids(
+    usernames: Iterable[str], force_refresh: bool = False
+) -> tuple[dict[str, str], dict[str, Exception]]:
+    """Look up the UUIDs for a whole bunch of players, using as few requests
+    to the Mojang API as possible
+
+    Parameters
+    ----------
+    usernames : list-like of str
+        The players' usernames. Duplicates (ignoring case) will only be
+        looked up once.
+    force_refresh : bool, optional
+        By default, lookups will be served from the cache (see: `get_cache()`)
+        whenever a fresh-enough entry is available. Pass in `force_refresh=True`
+        to always query the Mojang API (the cache will still be updated with
+        the results).
+
+    Returns
+    -------
+    dict of str to str
+        The UUIDs of each player that could be found, keyed by their
+        lowercased username
+    dict of str to Exception
+        The error encountered for each player whose UUID could not be
+        resolved, again keyed by lowercased username. A `ValueError` means
+        that no such player exists, while a `RuntimeError` means that
+        something else went wrong.
+
+    Notes
+    -----
+    Usernames are looked up `BULK_LOOKUP_LIMIT` at a time, and this method
+    does not check if the provided usernames are valid
+    """
+    cache = get_cache()
+    uuids: dict[str, str] = {}
+    errors: dict[str, Exception] = {}
+    to_fetch: list[str] = []
+    for username in dict.fromkeys(username.lower() for username in usernames):
+        uuid = None if cache is None or force_refresh else cache.get_uuid(username)
+        if uuid is None:
+            to_fetch.append(username)
+        else:
+            uuids[username] = uuid
+
+    for start in range(0, len(to_fetch), BULK_LOOKUP_LIMIT):
+        chunk = to_fetch[start : start + BULK_LOOKUP_LIMIT]
+        try:
+            found = _get_uuids_from_usernames(chunk)
+        except (ValueError, RuntimeError) as lookup_fail:
+            errors.update((username, lookup_fail) for username in chunk)
+            continue
+        for username in chunk:
+            try:
+                uuids[username] = found[username]
+            except KeyError:
+                errors[username] = ValueError(
+                    f"Couldn't find any profile with name {username}"
+                )
+                continue
+            if cache is not None:
+                cache.put_uuid(username, found[username])
+
+    return uuids, errors
@@ -1,32 +1,84 @@
 """Utilities for parsing an existing trade list"""
 
+import csv
 import json
+import os
 import re
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice, repeat
 from os import PathLike
 from pathlib import Path
-from typing import IO, Any
+from types import TracebackType
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    TypeVar,
+)
+from zipfile import ZipFile
 
-from . import HEAD_TRADE_FILENAME, HeadSpec
+from . import HEAD_TRADE_FILENAME, HeadSpec, parse_cache, snbt
 from ._legacy import convert_format_codes_to_format_flags
-from .extract import file_from_data_pack
+from .extract import (
+    get_data_pack,
+    list_available_packs,
+    list_pack_files,
+    open_pack_file,
+)
+from .resources import PackResources, ResourceLocation, get_pack_resources
 
+# locates the item being sold, which is the only part of a trade offer that
+# needs to be parsed
+_SELLS_PLAYER_HEAD = re.compile(r'(sell:)\s*{id:"?minecraft:player_head"?')
+_TRADE_INDEX = re.compile(r"wt_tradeIndex matches ([0-9]+) run")
 
-def _function_dirs(parent_dir: Path) -> tuple[Path, ...]:
-    """Given a data pack namespace folder, which should be the parent of a
-    "function(s)" folder, return all possible functions folders
+# which namespaces to look for a mob's loot table in, in order of priority
+_MOB_LOOT_TABLE_NAMESPACES = ("more_mob_heads", "minecraft")
 
-    Parameters
+
+class HeadTrade(NamedTuple):
+    """A player head trade read from a trade list
+
+    Attributes
     ----------
-    parent_dir : Path
-        The directory that should contain a function(s) folder
+    head : HeadSpec
+        The head being sold
+    trade_index : int or None
+        The trade index under which the trade is offered (or None if the
+        command doesn't check the trade index)
+    line_num : int
+        The line of the file the trade was read from (zero-indexed)
+    """
 
-    Returns
-    -------
-    tuple of Paths
-        The possible function folders, with priority given to the one recognized
-        by the most recent Minecraft versions
+    head: HeadSpec
+    trade_index: int | None
+    line_num: int
+
+
+class BlockTrade(NamedTuple):
+    """A block trade (a player head traded for a block) read from a trade list
+
+    Attributes
+    ----------
+    template : str
+        The trade command, with the trade index replaced by the placeholder
+        "IDX"
+    trade_index : int
+        The trade index under which the trade was originally offered
+    line_num : int
+        The line of the file the trade was read from (zero-indexed)
     """
-    return parent_dir / "function", parent_dir / "functions"
+
+    template: str
+    trade_index: int
+    line_num: int
 
 
 def parse_wandering_trades(
@@ -64,27 +116,139 @@ def parse_wandering_trades(
 
     Notes
     -----
-    This function is not smart enough to detect if the full spec doesn't
-    actually match the "skull owner"
+    - This function is not smart enough to detect if the full spec doesn't
+      actually match the "skull owner"
+    - To avoid holding the entire trade list in memory, use
+      `iter_wandering_trades()` instead
+    - Results are cached (see: `head_hunter.parse_cache`), so re-parsing a
+      trade list that hasn't changed is nearly instant
     """
     if trade_path is None:
-        with file_from_data_pack(
-            "wandering trades hermit edition",
-            (
-                function_folder / HEAD_TRADE_FILENAME
-                for function_folder in _function_dirs(Path("data") / "wandering_trades")
-            ),
-        ) as trade_file:
-            return _parse_wandering_trades(trade_file)
-    else:
-        with open(trade_path) as trade_file:
-            return _parse_wandering_trades(trade_file)
+        path, location = _find_trade_file()
+        return _parse_with_cache(
+            "wandering_trades", path, location, _collect_wandering_trades
+        )
+    return _parse_with_cache(
+        "wandering_trades", Path(trade_path), None, _collect_wandering_trades
+    )
 
 
-def _parse_wandering_trades(trade_file: IO) -> tuple[list[HeadSpec], list[str]]:
+def _collect_wandering_trades(trade_file: IO) -> tuple[list[HeadSpec], list[str]]:
     player_head_trades: list[HeadSpec] = []
     block_trades: list[str] = []
-    for line_num, line in enumerate(trade_file.readlines()):
+    for trade in _iter_wandering_trades(trade_file):
+        if isinstance(trade, HeadTrade):
+            player_head_trades.append(trade.head)
+        else:
+            block_trades.append(trade.template)
+    return player_head_trades, block_trades
+
+
+def iter_wandering_trades(
+    source: str | PathLike | IO | None = None,
+) -> Generator[HeadTrade | BlockTrade, None, None]:
+    """Lazily parse an existing trade list, one line at a time
+
+    Parameters
+    ----------
+    source : path or file-like, optional
+        The trade list you want to parse. This can be a path or an already
+        open file (in either text or binary mode, such as a file inside a
+        zipped data pack). If None is specified, this method will look for a
+        "wandering trades" pack in the packs folder and attempt to parse
+        `add_trade.mcfunction`  from there.
+
+    Yields
+    ------
+    HeadTrade or BlockTrade
+        Each player head trade in the file, in order
+
+    Raises
+    ------
+    FileNotFoundError
+        If the specified trade file doesn't exist
+    PermissionError
+        If you don't have the ability to open the trade file
+    RuntimeError
+        If a command in the file could not be parsed (this will be raised
+        only once parsing reaches that line)
+    """
+    if source is None:
+        with open_pack_file(*_find_trade_file()) as trade_file:
+            yield from _iter_wandering_trades(trade_file)
+    elif isinstance(source, (str, PathLike)):
+        with open(source) as trade_file:
+            yield from _iter_wandering_trades(trade_file)
+    else:
+        yield from _iter_wandering_trades(source)
+
+
+_T = TypeVar("_T")
+
+
+def _parse_with_cache(
+    kind: str,
+    path: Path,
+    location: str | None,
+    parse: Callable[[IO], tuple[list[HeadSpec], _T]],
+) -> tuple[list[HeadSpec], _T]:
+    """Parse a file, or load the results of parsing it from the parse cache
+    if it hasn't changed since the last time it was parsed
+
+    Parameters
+    ----------
+    kind : str
+        What sort of file this is (trade list, loot table...)
+    path : Path
+        The file to parse or, if a location is provided, the data pack
+        containing the file
+    location : str or None
+        The location of the file within the data pack
+    parse : function
+        The method for parsing the file (which will be passed the file,
+        opened in binary mode). Anything it returns alongside the list of heads
+        needs to be JSON-serializable.
+
+    Returns
+    -------
+    list of HeadSpec
+        The parsed heads
+    Any
+        Anything else returned by the parse method
+    """
+    cache = parse_cache.get_cache()
+    if cache is not None:
+        fingerprint = cache.fingerprint(path, location)
+        if (cached := cache.get(kind, fingerprint)) is not None:
+            return cached
+    with (
+        open(path, "rb") if location is None else open_pack_file(path, location)
+    ) as file_to_parse:
+        parsed = parse(file_to_parse)
+    if cache is not None:
+        # only cache the results if the file wasn't changed (or removed) while
+        # it was being read
+        try:
+            unchanged = cache.fingerprint(path, location) == fingerprint
+        except (FileNotFoundError, KeyError):
+            unchanged = False
+        if unchanged:
+            cache.put(kind, fingerprint, *parsed)
+    return parsed
+
+
+def _find_trade_file() -> tuple[Path, str]:
+    """Locate the trade list within the wandering trades pack"""
+    resources = get_pack_resources("wandering trades hermit edition")
+    return resources.pack, resources.resolve(
+        "wandering_trades", "function", Path(HEAD_TRADE_FILENAME).stem
+    )
+
+
+def _iter_wandering_trades(
+    trade_file: IO,
+) -> Generator[HeadTrade | BlockTrade, None, None]:
+    for line_num, line in enumerate(trade_file):
         if isinstance(line, bytes):
             line = line.decode("utf-8")
 
@@ -96,134 +260,114 @@ def _parse_wandering_trades(trade_file: IO) -> tuple[list[HeadSpec], list[str]]:
             # blank line or comment
             continue
 
-        if not re.search(r'sell:{id:"?minecraft:player_head"?', command):
+        if not (sold := _SELLS_PLAYER_HEAD.search(command)):
             # not selling a player head, so ignore
             continue
 
+        indexed = _TRADE_INDEX.search(command)
+
         if 'buyB:{id:"minecraft:air"' not in command and "buyB:{id:" in command:
             # then it's a block trade
-            matched = re.search(r"(?:wt_tradeIndex matches ([0-9]*) run)", command)
-            if not matched:
+            if not indexed:
                 raise RuntimeError(parse_fail_message)
-            span = matched.span(1)
-            block_trades.append(command[: span[0]] + "IDX" + command[span[1] :])
+            span = indexed.span(1)
+            yield BlockTrade(
+                command[: span[0]] + "IDX" + command[span[1] :],
+                int(indexed.group(1)),
+                line_num,
+            )
             continue
 
-        # this is brittle generally, but depth matching is probably YAGNI
-        matched = re.search(r"(components|tag):({.*)}}", command)
-        if not matched:
-            raise RuntimeError(parse_fail_message)
         try:
-            match matched.group(1):
-                case "components":
-                    head_spec = _parse_head_from_trade(matched.group(2))
-                case "tag":
-                    head_spec = _parse_head_from_legacy_trade(matched.group(2))
-                case _:  # pragma: no cover
-                    # this should never happen
-                    raise RuntimeError(parse_fail_message)
-        except (ValueError, NotImplementedError) as parse_fail:
+            sell, _ = snbt.decode(command, sold.end(1))
+            if "components" in sell:
+                head_spec = _parse_head_from_trade(sell["components"])
+            elif "tag" in sell:
+                head_spec = _parse_head_from_legacy_trade(sell["tag"])
+            else:
+                raise ValueError("Trade does not specify the head")
+        except (ValueError, KeyError, TypeError, NotImplementedError) as parse_fail:
             raise RuntimeError(parse_fail_message) from parse_fail
 
-        player_head_trades.append(head_spec)
+        yield HeadTrade(head_spec, int(indexed.group(1)) if indexed else None, line_num)
 
-    return player_head_trades, block_trades
 
+def _parse_head_from_trade(components: dict[str, Any]) -> HeadSpec:
+    components = {
+        key.removeprefix("minecraft:"): value for key, value in components.items()
+    }
 
-def _parse_head_from_trade(head_str: str) -> HeadSpec:
-    for component in (
-        "item_name",
-        "profile",
-        "properties",
-        "rarity",
-        "note_block_sound",
-    ):
-        head_str = (
-            head_str.replace(f"minecraft:{component}:", f'"{component}":')
-            .replace(f"{component}:", f'"{component}":')
-            .replace(f'"minecraft:{component}":', f'"{component}":')
-        )
-    head_str = (
-        head_str.replace("name:", '"name":')
-        .replace("value:", '"value":')
-        .replace("'\"", '"\\"')
-        .replace("\"'", '\\""')
-        .replace("'{", "{")
-        .replace("}'", "}")
-    )
+    as_dict: dict[str, Any] = _parse_text_component(components["item_name"])
 
-    try:
-        parsed = json.loads(head_str)
-    except json.JSONDecodeError as parse_fail:
-        raise ValueError(f"{head_str}\nis not valid JSON") from parse_fail
-
-    as_dict: dict[str, Any] = {}
-
-    match parsed["item_name"]:
-        case dict():
-            as_dict["name"] = parsed["item_name"].pop("text")
-            as_dict.update(parsed["item_name"])
-        case str():
-            as_dict["name"] = json.loads(parsed["item_name"])
-        case _:
-            raise ValueError(f"Could not parse display name of head from {head_str}")
-
-    try:
-        as_dict["rarity"] = parsed["rarity"]
-    except KeyError:
-        pass
+    for component in ("rarity", "note_block_sound"):
+        if component in components:
+            as_dict[component] = components[component]
 
-    try:
-        match parsed["profile"]:
-            case str():
-                as_dict["player_name"] = parsed["profile"]
-            case dict():
-                try:
-                    as_dict["player_name"] = parsed["profile"]["name"]
-                except KeyError:
-                    pass
+    match components.get("profile"):
+        case str(player_name):
+            as_dict["player_name"] = player_name
+        case dict(profile):
+            if "name" in profile:
+                as_dict["player_name"] = profile["name"]
+            if "properties" in profile:
                 try:
-                    as_dict["texture"] = parsed["profile"]["properties"][0]["value"]
-                except KeyError:
-                    pass
-                except IndexError:
-                    raise ValueError(f"Could not parse texture from {head_str}")
-    except KeyError:
-        # TODO: warn that there's no head set?
-        pass
-
-    # TODO: parse note block sound (YAGNI for the official data pack)
+                    as_dict["texture"] = profile["properties"][0]["value"]
+                except (IndexError, KeyError) as no_texture:
+                    raise ValueError(
+                        f"Could not parse texture from {profile}"
+                    ) from no_texture
+        case None:
+            # TODO: warn that there's no head set?
+            pass
+        case _:
+            raise ValueError(f"Could not parse profile: {components['profile']}")
 
     return HeadSpec(**as_dict)
 
 
-def _parse_head_from_legacy_trade(head_str: str) -> HeadSpec:
-    if (
-        matched := re.search(
-            r'{Name:\\?"{\\?"text\\?":\\?"(.*?)\\?"}\\?"},SkullOwner:(.*)}', head_str
-        )
-    ) is None:
-        raise ValueError(
-            "Could not identify display name and/or skull owner from\n" + head_str
-        )
+def _parse_head_from_legacy_trade(tag: dict[str, Any]) -> HeadSpec:
+    try:
+        as_dict = _parse_text_component(tag["display"]["Name"])
+    except KeyError as no_name:
+        raise ValueError(f"Could not identify display name from {tag}") from no_name
 
-    name = matched.group(1)
-    as_dict: dict[str, Any] = convert_format_codes_to_format_flags(name)
-    as_dict["name"] = re.sub(r'\\?"|\xA7.|}', "", name)
-    skull_str = matched.group(2)
+    name = as_dict["name"]
+    as_dict.update(convert_format_codes_to_format_flags(name))
+    as_dict["name"] = re.sub("\xa7.", "", name)
 
-    if texture_match := re.search(
-        r'Properties:{textures:\[{Value:"([A-Za-z0-9=]*)"}\]}', skull_str
-    ):
-        as_dict["texture"] = texture_match.group(0)
-    elif re.match(r"^[A-Za-z0-9_]{3,16}$", skull_str):
-        as_dict["player_name"] = skull_str
-    else:
-        raise ValueError(f"Could not parse skull owner: {skull_str}")
+    match tag.get("SkullOwner"):
+        case str(player_name):
+            as_dict["player_name"] = player_name
+        case {"Properties": {"textures": [{"Value": str(texture)}, *_]}}:
+            as_dict["texture"] = texture
+        case None:
+            pass
+        case skull_owner:
+            raise ValueError(f"Could not parse skull owner: {skull_owner}")
+
+    if note_block_sound := tag.get("BlockEntityTag", {}).get("note_block_sound"):
+        as_dict["note_block_sound"] = note_block_sound
 
     return HeadSpec(**as_dict)
 
 
+def _parse_text_component(text_component: str | dict[str, Any]) -> dict[str, Any]:
+    """Extract the name and formatting from a text component (which may be
+    JSON-encoded)"""
+    if isinstance(text_component, str):
+        try:
+            text_component = json.loads(text_component)
+        except json.JSONDecodeError:
+            pass  # a plain string
+    if isinstance(text_component, str):
+        return {"name": text_component}
+    if isinstance(text_component, dict) and isinstance(text_component.get("text"), str):
+        as_dict = dict(text_component)
+        as_dict["name"] = as_dict.pop("text")
+        return as_dict
+    raise ValueError(f"Could not parse display name from {text_component}")
+
+
 def parse_mob_heads(mob: str | PathLike) -> list[HeadSpec]:
     """Extract head specs from a "More Mob Heads" data pack loot table.
 
@@ -255,48 +399,162 @@ def parse_mob_heads(mob: str | PathLike) -> list[HeadSpec]:
         If you don't have the ability to open the file
     JSONDecodeError
         If the specified file is not valid JSON
+
+    Notes
+    -----
+    Results are cached (see: `head_hunter.parse_cache`), so re-parsing a loot
+    table that hasn't changed is nearly instant
     """
     # first check if it's a file
+    if Path(mob).is_file():
+        return _parse_with_cache(
+            "mob_heads", Path(mob), None, _parse_mob_heads_uncached
+        )[0]
+
     try:
-        with open(mob) as mob_file:
-            return _parse_mob_heads(mob_file)
-    except (FileNotFoundError, PermissionError, json.JSONDecodeError) as oops:
-        # maybe it's a relative path inside a pack?
-        try:
-            with file_from_data_pack("more mob heads", mob) as mob_file:
-                return _parse_mob_heads(mob_file)
-        except (KeyError, json.JSONDecodeError, PermissionError):
-            pass
-        if not isinstance(mob, str):
-            raise oops
+        resources = get_pack_resources("more mob heads")
+    except KeyError as not_found:
+        raise FileNotFoundError(f"Could not find a loot table for {mob}") from not_found
 
-    # now check if it's the mob name
+    # maybe it's a relative path inside the pack?
+    if (location := Path(mob).as_posix()) not in resources.files:
+        # then it should be the mob name
+        for namespace in _MOB_LOOT_TABLE_NAMESPACES:
+            resource = ResourceLocation(namespace, "loot_table", f"entities/{mob}")
+            if resource in resources:
+                location = resources[resource]
+                break
+        else:
+            raise FileNotFoundError(f"Could not find a loot table for {mob}")
+    return _parse_with_cache(
+        "mob_heads", resources.pack, location, _parse_mob_heads_uncached
+    )[0]
 
-    for namespace, loot_table_dir in (
-        ("more_mob_heads", "loot_table"),
-        ("minecraft", "loot_table"),
-        ("minecraft", "loot_tables"),
-    ):
+
+def parse_all_mob_heads(pack: str | PathLike | None = None) -> "MobHeads":
+    """Extract the head specs for every mob in a "More Mob Heads" data pack
+
+    Parameters
+    ----------
+    pack : path, optional
+        The data pack (zipped or not) to parse. If None is specified, this
+        method will look for a "more mob heads" data pack in the "packs"
+        folder.
+
+    Returns
+    -------
+    MobHeads
+        A mapping of each mob (e.g. "zombie" or "sheep/red") to the heads
+        it can drop. Each mob's loot table is only parsed the first time
+        that mob is looked up.
+
+    Raises
+    ------
+    KeyError
+        If no pack is specified and a "more mob heads" pack can't be found
+    FileNotFoundError
+        If the specified pack doesn't exist
+    """
+    return MobHeads(get_data_pack("more mob heads") if pack is None else pack)
+
+
+class MobHeads(Mapping[str, list[HeadSpec]]):
+    """Read-only mapping of mobs to the heads they drop, backed by the loot
+    tables in a data pack
+
+    Parameters
+    ----------
+    pack : path
+        The data pack (zipped or not) to read from
+
+    Raises
+    ------
+    FileNotFoundError
+        If the specified pack doesn't exist
+
+    Notes
+    -----
+    - The pack is opened once, when this object is created, and its loot
+      tables are only read (and parsed) the first time each mob is looked up.
+      Looking up a mob whose loot table can't be parsed will raise the same
+      errors as `parse_mob_heads()`.
+    - If a mob has loot tables in multiple places, the one used will be the
+      same one that `parse_mob_heads()` would pick.
+    - Use this as a context manager (or call `close()`) to release the
+      underlying file.
+    """
+
+    def __init__(self, pack: str | PathLike):
+        self.pack = Path(pack)
+        if self.pack.is_dir():
+            self._zipped: ZipFile | None = None
+            files = list_pack_files(self.pack)
+        else:
+            self._zipped = ZipFile(self.pack)
+            files = self._zipped.namelist()
+
+        priorities = {
+            namespace: rank for rank, namespace in enumerate(_MOB_LOOT_TABLE_NAMESPACES)
+        }
+        resources = PackResources(self.pack, files)
+        self._loot_tables: dict[str, str] = {}
+        for resource in sorted(
+            resources.list_resources("loot_table", prefix="entities/"),
+            key=lambda resource: priorities.get(resource.namespace, len(priorities)),
+        ):
+            mob = resource.name.removeprefix("entities/")
+            self._loot_tables.setdefault(mob, resources[resource])
+        self._heads: dict[str, list[HeadSpec]] = {}
+
+    def __enter__(self) -> "MobHeads":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying file"""
+        if self._zipped:
+            self._zipped.close()
+
+    def __len__(self) -> int:
+        return len(self._loot_tables)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(sorted(self._loot_tables))
+
+    def __getitem__(self, mob: str) -> list[HeadSpec]:
         try:
-            with file_from_data_pack(
-                "more mob heads",
-                Path("data") / namespace / loot_table_dir / "entities" / f"{mob}.json",
-            ) as mob_file:
-                return _parse_mob_heads(mob_file)
+            return self._heads[mob]
         except KeyError:
-            continue
-    else:
-        raise FileNotFoundError(f"Could not find a loot table for {mob}")
+            pass
+        loot_table = self._loot_tables[mob]
+        with (
+            self._zipped.open(loot_table)
+            if self._zipped
+            else (self.pack / loot_table).open("rb")
+        ) as mob_file:
+            self._heads[mob] = _parse_mob_heads(mob_file)
+        return self._heads[mob]
+
+
+def _parse_mob_heads_uncached(mob_file: IO) -> tuple[list[HeadSpec], None]:
+    return _parse_mob_heads(mob_file), None
 
 
 def _parse_mob_heads(mob_file: IO) -> list[HeadSpec]:
     loot_table = json.load(mob_file)
     head_drops: list[dict] = []
-    for pool in loot_table["pools"]:
-        for entry in pool["entries"]:
+    for pool in loot_table.get("pools", ()):
+        for entry in pool.get("entries", ()):
             if "children" in entry:
                 for drop in entry["children"]:
-                    if drop["name"] == "minecraft:player_head":
+                    if drop.get("name", "") == "minecraft:player_head":
                         head_drops.append(drop)
             if entry.get("name", "") == "minecraft:player_head":
                 head_drops.append(entry)
@@ -320,26 +578,166 @@ def _parse_mob_heads(mob_file: IO) -> list[HeadSpec]:
                     )
                 )
             else:
-                skull_str = head_function["tag"]
-                match = re.search(
-                    r'Name:"(.*?)".*Properties:{textures:\[{Value:"(.*?)"}\]}}'
-                    r'(?:,BlockEntityTag:{note_block_sound:"(.*)")?',
-                    skull_str,
-                )
-                if not match:
-                    parse_fail_message = f"Could not parse:\n {drop}"
-                    raise RuntimeError(parse_fail_message)
-                head_specs.append(
-                    HeadSpec(
-                        match.group(1),
-                        texture=match.group(1),
-                        note_block_sound=match.group(2),
+                try:
+                    head_specs.append(
+                        _parse_head_from_legacy_trade(snbt.loads(head_function["tag"]))
                     )
-                )
+                except ValueError as parse_fail:
+                    raise RuntimeError(f"Could not parse:\n {drop}") from parse_fail
 
     return head_specs
 
 
+class ParsedHead(NamedTuple):
+    """A head parsed from a data pack, along with where it was found
+
+    Attributes
+    ----------
+    head : HeadSpec
+        The parsed head
+    pack : Path
+        The data pack (zip file or folder) the head was found in
+    file : str
+        The file within the pack that the head was parsed from (as a
+        "/"-delimited path relative to the pack root)
+    line_num : int or None
+        For heads parsed from trade functions, the line of the file the trade
+        was read from (zero-indexed). For heads parsed from loot tables,
+        this will be None.
+    """
+
+    head: HeadSpec
+    pack: Path
+    file: str
+    line_num: int | None
+
+
+# parsing each file is quick, so hand files to the workers in batches to
+# avoid re-opening the same zip file over and over
+_FILES_PER_TASK = 32
+
+
+def parse_packs(
+    packs: Iterable[str | PathLike] | None = None,
+    max_workers: int | None = None,
+    strict: bool = True,
+) -> list[ParsedHead]:
+    """Harvest every head from every trade function and mob loot table in a
+    collection of data packs
+
+    Parameters
+    ----------
+    packs : list of paths, optional
+        The data packs (zipped or not) to parse. If None is specified, this
+        method will parse every pack in the "packs" folder
+        (see: `head_hunter.extract.list_available_packs()`).
+    max_workers : int, optional
+        The number of processes to parse files in. By default, this will be
+        the number of CPUs on the machine. Pass in `max_workers=1` to parse
+        everything in the current process.
+    strict : bool, optional
+        By default, a file that can't be parsed will raise an error. Pass in
+        `strict=False` to instead skip that file (with a warning).
+
+    Returns
+    -------
+    list of ParsedHead
+        Every head found, along with where it was found. Heads are returned
+        in order (by pack, then by file, then by line) regardless of the
+        order in which the files finish parsing.
+
+    Raises
+    ------
+    FileNotFoundError
+        If any of the specified packs don't exist
+    RuntimeError
+        If a file could not be parsed (and `strict=True`)
+    """
+    if packs is None:
+        packs = list_available_packs()
+    task_packs: list[Path] = []
+    task_files: list[tuple[str, ...]] = []
+    for pack in packs:
+        files = _list_head_files(Path(pack))
+        for i in range(0, len(files), _FILES_PER_TASK):
+            task_packs.append(Path(pack))
+            task_files.append(tuple(files[i : i + _FILES_PER_TASK]))
+
+    if max_workers == 1:
+        return _collect_parsed(
+            map(_parse_pack_files, task_packs, task_files, repeat(strict))
+        )
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return _collect_parsed(
+            pool.map(_parse_pack_files, task_packs, task_files, repeat(strict))
+        )
+
+
+def _collect_parsed(
+    results: Iterable[tuple[list[ParsedHead], list[str]]],
+) -> list[ParsedHead]:
+    """Combine the results of each `_parse_pack_files()` task (in order),
+    warning about any files that couldn't be parsed"""
+    parsed: list[ParsedHead] = []
+    for heads, failures in results:
+        parsed.extend(heads)
+        for failure in failures:
+            warnings.warn(failure, RuntimeWarning)
+    return parsed
+
+
+def _list_head_files(pack: Path) -> list[str]:
+    """List all the trade functions and mob loot tables in a data pack"""
+    resources = PackResources.from_pack(pack)
+    return sorted(
+        resources[resource]
+        for resource in (
+            resources.list_resources("function")
+            + resources.list_resources("loot_table", prefix="entities/")
+        )
+    )
+
+
+def _parse_pack_files(
+    pack: Path, files: tuple[str, ...], strict: bool
+) -> tuple[list[ParsedHead], list[str]]:
+    """Parse a batch of files from a single pack (this is what's run in each
+    worker process)"""
+    parsed: list[ParsedHead] = []
+    failures: list[str] = []
+    zipped = None if pack.is_dir() else ZipFile(pack)
+    try:
+        for file in files:
+            try:
+                with (
+                    zipped.open(file) if zipped else (pack / file).open("rb")
+                ) as pack_file:
+                    # parse the whole file before keeping any of it, so that a
+                    # file that fails partway through is skipped entirely
+                    if file.endswith(".json"):
+                        file_heads = [
+                            ParsedHead(head, pack, file, None)
+                            for head in _parse_mob_heads(pack_file)
+                        ]
+                    else:
+                        file_heads = [
+                            ParsedHead(trade.head, pack, file, trade.line_num)
+                            for trade in _iter_wandering_trades(pack_file)
+                            if isinstance(trade, HeadTrade)
+                        ]
+            except (RuntimeError, ValueError, KeyError, TypeError) as parse_fail:
+                message = f"Could not parse {file} from {pack}:\n{parse_fail}"
+                if strict:
+                    raise RuntimeError(message) from parse_fail
+                failures.append(message)
+                continue
+            parsed.extend(file_heads)
+    finally:
+        if zipped:
+            zipped.close()
+    return parsed, failures
+
+
 def parse_give_command(command: str, name: str, **kwargs) -> HeadSpec:
     """Parse a /give command (such as you'd find from a skin lookup site) to
     extract just the relevant specification that needs to go into the head-list
@@ -402,3 +800,228 @@ def _parse_give_v4(command) -> tuple[str, str]:
         + command
         + "\n\nEither the command is invalid or the parser doesn't recognize its syntax."
     )
+
+
+class GiveCommandError(NamedTuple):
+    """A row of a batch import that could not be turned into a head
+
+    Attributes
+    ----------
+    row : int
+        The position of the row in the file (zero-indexed, not counting
+        the header of a CSV)
+    command : str or None
+        The row's `/give` command (if it has one)
+    name : str or None
+        The row's display name (if it has one)
+    message : str
+        What went wrong
+    """
+
+    row: int
+    command: str | None
+    name: str | None
+    message: str
+
+
+# how many rows to hand to each worker at a time when importing in parallel
+_COMMANDS_PER_TASK = 256
+
+_GIVE_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+_FORMAT_FLAGS = ("italic", "bold", "underlined", "strikethrough", "obfuscated")
+
+# the stand-ins for bytes that aren't valid UTF-8 (see: "surrogateescape")
+_UNDECODABLE = re.compile("[\udc80-\udcff]")
+
+
+def import_give_commands(
+    source: str | PathLike | IO,
+    file_format: str | None = None,
+    max_workers: int | None = 1,
+    errors: list[GiveCommandError] | None = None,
+) -> Generator[HeadSpec, None, None]:
+    """Parse a whole file of /give commands (such as you'd scrape from a skin
+    lookup site), one row at a time
+
+    Parameters
+    ----------
+    source : path or file-like
+        The file to import. Each row must provide a "command" and a "name"
+        and may provide any other customizations to give to the head
+        (see: `HeadSpec`), e.g.
+        ```
+        {"command": "/give @p player_head[...]", "name": "Bob", "bold": true}
+        ```
+        CSVs must have a header row naming the columns. Empty CSV cells are
+        ignored, and formatting flags can be given as "true" / "false".
+    file_format : str, optional
+        Either "jsonl" or "csv". If None is specified, the format will be
+        inferred from the file extension.
+    max_workers : int, optional
+        The number of processes to parse commands in. By default, everything
+        is parsed in the current process. Pass in `max_workers=None` to use
+        one process per CPU.
+    errors : list, optional
+        If provided, each row that can't be parsed will be appended to this
+        list as a `GiveCommandError`. Otherwise, rows that can't be parsed
+        are skipped with a warning. Rows that can't even be read (such as
+        malformed CSV rows or rows that aren't valid UTF-8) are reported
+        the same way.
+
+    Yields
+    ------
+    HeadSpec
+        The head specified by each row that could be parsed, in order
+
+    Raises
+    ------
+    FileNotFoundError
+        If the specified file doesn't exist
+    ValueError
+        If the file format isn't supported (or can't be inferred)
+
+    Notes
+    -----
+    Rows are read lazily, and only a few batches are ever being parsed at
+    once, so this can be used on files that won't fit in memory
+    """
+    if file_format is None:
+        if not isinstance(source, (str, PathLike)):
+            raise ValueError("The file format must be specified for open files")
+        file_format = _GIVE_FORMATS.get(Path(source).suffix.lower())
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+    if isinstance(source, (str, PathLike)):
+        # undecodable bytes are caught row by row (see: `_read_give_rows()`)
+        with open(
+            source, encoding="utf-8", errors="surrogateescape", newline=""
+        ) as import_file:
+            yield from import_give_commands(
+                import_file, file_format, max_workers, errors
+            )
+        return
+
+    rows = _read_give_rows(source, file_format)
+    batches = iter(lambda: list(islice(rows, _COMMANDS_PER_TASK)), [])
+
+    def report(failure: GiveCommandError) -> None:
+        if errors is None:
+            warnings.warn(
+                f"Could not parse row {failure.row}: {failure.message}",
+                RuntimeWarning,
+            )
+        else:
+            errors.append(failure)
+
+    if max_workers == 1:
+        for batch in batches:
+            for result in _parse_give_rows(batch):
+                if isinstance(result, GiveCommandError):
+                    report(result)
+                else:
+                    yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        # keep a bounded number of batches in flight so that the whole file is
+        # never read into memory at once
+        in_flight: deque[Future] = deque(
+            pool.submit(_parse_give_rows, batch)
+            for batch in islice(batches, 2 * (max_workers or os.cpu_count() or 1))
+        )
+        while in_flight:
+            results = in_flight.popleft().result()
+            if batch := next(batches, []):
+                in_flight.append(pool.submit(_parse_give_rows, batch))
+            for result in results:
+                if isinstance(result, GiveCommandError):
+                    report(result)
+                else:
+                    yield result
+
+
+def _read_give_rows(
+    import_file: IO, file_format: str
+) -> Iterator[tuple[int, dict[str, Any] | GiveCommandError]]:
+    """Read the rows of a batch import file, without parsing the commands"""
+    if file_format == "csv":
+        for row_num, row in enumerate(_read_guarded(csv.DictReader(import_file))):
+            if isinstance(row, ValueError):
+                yield row_num, GiveCommandError(row_num, None, None, str(row))
+                continue
+            if any(
+                isinstance(text, str) and _UNDECODABLE.search(text)
+                for text in (*row.keys(), *row.values())
+            ):
+                yield row_num, GiveCommandError(
+                    row_num, None, None, "Row is not valid UTF-8"
+                )
+                continue
+            yield row_num, {
+                key: (value.lower() in ("true", "1") if key in _FORMAT_FLAGS else value)
+                for key, value in row.items()
+                if key and value
+            }
+        return
+    for row_num, line in enumerate(_read_guarded(iter(import_file))):
+        if isinstance(line, ValueError):
+            yield row_num, GiveCommandError(row_num, None, None, str(line))
+            continue
+        if not line.strip():
+            continue
+        try:
+            if _UNDECODABLE.search(line):
+                raise ValueError("Row is not valid UTF-8")
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("Row is not a JSON object")
+        except ValueError as bad_row:
+            yield row_num, GiveCommandError(row_num, None, None, str(bad_row))
+            continue
+        yield row_num, row
+
+
+def _read_guarded(rows: Iterator[_T]) -> Iterator[_T | ValueError]:
+    """Read each row from a file, handing back (rather than raising) the
+    error for any row that can't be read. Reading stops after a row that
+    can't be decoded, as there's no telling where the next row starts."""
+    while True:
+        try:
+            yield next(rows)
+        except StopIteration:
+            return
+        except csv.Error as bad_row:
+            yield ValueError(str(bad_row))
+        except UnicodeDecodeError as bad_row:
+            yield bad_row
+            return
+
+
+def _parse_give_rows(
+    rows: list[tuple[int, dict[str, Any] | GiveCommandError]],
+) -> list[HeadSpec | GiveCommandError]:
+    """Parse a batch of rows from a batch import (this is what's run in each
+    worker process)"""
+    results: list[HeadSpec | GiveCommandError] = []
+    for row_num, row in rows:
+        if isinstance(row, GiveCommandError):
+            results.append(row)
+            continue
+        kwargs = dict(row)
+        command = kwargs.pop("command", None)
+        name = kwargs.pop("name", None)
+        try:
+            if not isinstance(command, str) or not isinstance(name, str):
+                raise ValueError('Row must specify a "command" and a "name"')
+            results.append(parse_give_command(command, name, **kwargs))
+        except (ValueError, TypeError) as parse_fail:
+            results.append(
+                GiveCommandError(
+                    row_num,
+                    command if isinstance(command, str) else None,
+                    name if isinstance(name, str) else None,
+                    str(parse_fail),
+                )
+            )
+    return results
@@ -0,0 +1,365 @@
+"""Persistent cache of parsed trade lists and loot tables, so that packs that
+haven't changed don't need to be re-parsed every run"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from os import PathLike
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from . import CACHE_FOLDER, HeadSpec
+from .binary import BinaryHeadList, write_binary
+
+# bump this whenever a change to the parsers would change their output, so
+# that results cached by older versions are ignored
+PARSER_VERSION = 1
+
+
+class ParseCacheStats(NamedTuple):
+    """Hit / miss counters for a `ParseCache`
+
+    Attributes
+    ----------
+    hits : int
+        The number of parses that were served from the cache
+    misses : int
+        The number of files that had to be parsed
+    pack_hits : int
+        The number of data pack validity checks that were served from the cache
+    pack_misses : int
+        The number of data packs that had to be opened to check their validity
+    """
+
+    hits: int = 0
+    misses: int = 0
+    pack_hits: int = 0
+    pack_misses: int = 0
+
+
+class ParseCache:
+    """Persistent on-disk cache of parsed head lists, keyed by the content of
+    the file that was parsed
+
+    Parameters
+    ----------
+    cache_folder : path, optional
+        The folder in which to store the cache. If None is given, the cache
+        will be stored in the package's `CACHE_FOLDER`.
+    max_entries : int, optional
+        The maximum number of parsed files to keep. Once this limit is
+        exceeded, the least recently used entries will be evicted.
+        Default is 1,000.
+
+    Notes
+    -----
+    - Files inside of zipped data packs are identified by their name, CRC
+      and size (as recorded in the zip file, so checking the cache doesn't
+      require decompressing anything). Other files are identified by a hash
+      of their contents, which is only recomputed when the file's
+      modification time or size changes. Either way, editing a file
+      automatically invalidates its cached results.
+    - Parsed heads are stored in the indexed binary format
+      (see: `head_hunter.binary`).
+    - A single cache can be safely shared across threads.
+    """
+
+    FILENAME = "parse.sqlite3"
+    HEADS_FOLDER = "parsed"
+
+    def __init__(
+        self, cache_folder: str | PathLike | None = None, max_entries: int = 1_000
+    ):
+        self.folder = Path(cache_folder or CACHE_FOLDER).resolve()
+        self.path = self.folder / self.FILENAME
+        self.max_entries = max_entries
+        self._stats = ParseCacheStats()
+        self._lock = threading.Lock()
+
+        (self.folder / self.HEADS_FOLDER).mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parsed ("
+                "key TEXT PRIMARY KEY, extra TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS digests ("
+                "path TEXT PRIMARY KEY, mtime INTEGER NOT NULL, size INTEGER NOT NULL,"
+                " digest TEXT NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS packs ("
+                "path TEXT PRIMARY KEY, mtime INTEGER NOT NULL, size INTEGER NOT NULL,"
+                " valid INTEGER NOT NULL)"
+            )
+
+    @property
+    def stats(self) -> ParseCacheStats:
+        """The hit / miss counters accumulated since this cache was opened
+        (or since the last time they were reset)"""
+        return self._stats
+
+    def reset_stats(self) -> None:
+        """Zero out the hit / miss counters"""
+        with self._lock:
+            self._stats = ParseCacheStats()
+
+    def fingerprint(self, path: str | PathLike, location: str | None = None) -> str:
+        """Generate a key identifying the contents of a file
+
+        Parameters
+        ----------
+        path : path
+            The file to fingerprint or, if a location is provided, the data pack
+            (zipped or not) containing the file
+        location : str, optional
+            The location of the file within the data pack (as a "/"-delimited
+            path relative to the pack root)
+
+        Returns
+        -------
+        str
+            A key that will change whenever the file's contents do
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file doesn't exist
+        KeyError
+            If the location doesn't exist within the (zipped) data pack
+        """
+        path = Path(path)
+        if location is not None:
+            if not path.is_dir():
+                from head_hunter import extract
+
+                with extract._zip_pool.open(path) as zipped:
+                    info = zipped.getinfo(location)
+                return f"zip:{location}:{info.CRC:08x}:{info.file_size}"
+            path = path / location
+        return "file:" + self._digest(path)
+
+    def get(self, kind: str, fingerprint: str) -> tuple[list[HeadSpec], Any] | None:
+        """Look up a previously parsed file
+
+        Parameters
+        ----------
+        kind : str
+            What sort of parse this was (the same file will be parsed
+            differently depending on whether it's a trade list or a loot table)
+        fingerprint : str
+            The file's fingerprint (see: `fingerprint()`)
+
+        Returns
+        -------
+        list of HeadSpec
+            The heads parsed from that file
+        Any
+            Any other information that was stored along with the heads
+
+        _or_
+
+        None
+            If the file is not in the cache
+        """
+        key = self._key(kind, fingerprint)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT extra FROM parsed WHERE key = ?", (key,)
+            ).fetchone()
+            try:
+                if row is None:
+                    raise FileNotFoundError(key)
+                with BinaryHeadList(self._heads_path(key)) as heads:
+                    parsed = list(heads), json.loads(row[0])
+            except (FileNotFoundError, ValueError):
+                self._stats = self._stats._replace(misses=self._stats.misses + 1)
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE parsed SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+            self._stats = self._stats._replace(hits=self._stats.hits + 1)
+        return parsed
+
+    def put(
+        self, kind: str, fingerprint: str, heads: list[HeadSpec], extra: Any = None
+    ) -> None:
+        """Store the results of parsing a file
+
+        Parameters
+        ----------
+        kind : str
+            What sort of parse this was
+        fingerprint : str
+            The file's fingerprint (see: `fingerprint()`)
+        heads : list of HeadSpec
+            The heads parsed from that file
+        extra : Any, optional
+            Any other (JSON-serializable) information to store along with
+            the heads
+        """
+        key = self._key(kind, fingerprint)
+        with self._lock:
+            write_binary(heads, self._heads_path(key))
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parsed VALUES (?, ?, ?)",
+                    (key, json.dumps(extra), time.time()),
+                )
+                evicted = self._db.execute(
+                    "SELECT key FROM parsed ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                    (self.max_entries,),
+                ).fetchall()
+                self._db.executemany("DELETE FROM parsed WHERE key = ?", evicted)
+            for (evicted_key,) in evicted:
+                self._heads_path(evicted_key).unlink(missing_ok=True)
+
+    def is_valid_pack(self, pack_path: str | PathLike) -> bool | None:
+        """Look up whether a (zipped) data pack was previously found to be valid
+
+        Parameters
+        ----------
+        pack_path : path
+            The data pack
+
+        Returns
+        -------
+        bool or None
+            Whether the pack is valid, or None if it's not in the cache (or
+            has changed since it was checked)
+        """
+        stat = os.stat(pack_path)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT valid FROM packs WHERE path = ? AND mtime = ? AND size = ?",
+                (os.fspath(Path(pack_path).resolve()), stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+            if row is None:
+                self._stats = self._stats._replace(
+                    pack_misses=self._stats.pack_misses + 1
+                )
+                return None
+            self._stats = self._stats._replace(pack_hits=self._stats.pack_hits + 1)
+        return row[0] == 1
+
+    def put_pack_validity(self, pack_path: str | PathLike, valid: bool) -> None:
+        """Store whether a (zipped) data pack is valid
+
+        Parameters
+        ----------
+        pack_path : path
+            The data pack
+        valid : bool
+            Whether the data pack is valid
+        """
+        stat = os.stat(pack_path)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO packs VALUES (?, ?, ?, ?)",
+                (
+                    os.fspath(Path(pack_path).resolve()),
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    int(valid),
+                ),
+            )
+
+    def clear(self) -> None:
+        """Remove everything from the cache"""
+        with self._lock:
+            with self._db:
+                for table in ("parsed", "digests", "packs"):
+                    self._db.execute(f"DELETE FROM {table}")
+            for heads_file in (self.folder / self.HEADS_FOLDER).glob("*.hhbl"):
+                heads_file.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the connection to the cache database"""
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _key(kind: str, fingerprint: str) -> str:
+        return f"{kind}/v{PARSER_VERSION}/{fingerprint}"
+
+    def _heads_path(self, key: str) -> Path:
+        return (
+            self.folder
+            / self.HEADS_FOLDER
+            / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".hhbl")
+        )
+
+    def _digest(self, file_path: Path) -> str:
+        """Hash the contents of a file, reusing the previous hash if the file's
+        modification time and size haven't changed"""
+        stat = os.stat(file_path)
+        path = os.fspath(file_path.resolve())
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest FROM digests WHERE path = ? AND mtime = ? AND size = ?",
+                (path, stat.st_mtime_ns, stat.st_size),
+            ).fetchone()
+        if row is not None:
+            return row[0]
+        hasher = hashlib.blake2b()
+        with open(file_path, "rb") as file:
+            while chunk := file.read(1 << 16):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, digest),
+            )
+        return digest
+
+
+_cache: ParseCache | None = None
+_caching_enabled = True
+_lock = threading.Lock()
+
+
+def get_cache() -> ParseCache | None:
+    """Get the cache used for parsing trade lists and loot tables, opening the
+    default cache if none has been set
+
+    Returns
+    -------
+    ParseCache or None
+        The cache currently in use, or None if caching has been disabled (or
+        if the default cache couldn't be opened, in which case caching will
+        be disabled with a warning)
+    """
+    global _cache, _caching_enabled
+    with _lock:
+        if _cache is None and _caching_enabled:
+            try:
+                _cache = ParseCache()
+            except (OSError, sqlite3.Error) as cache_fail:
+                warnings.warn(
+                    "Could not open the parse cache, so parsing will not be"
+                    f" cached:\n{cache_fail!r}",
+                    RuntimeWarning,
+                )
+                _caching_enabled = False
+    return _cache
+
+
+def set_cache(cache: ParseCache | None) -> None:
+    """Set the cache to use for parsing trade lists and loot tables
+
+    Parameters
+    ----------
+    cache : ParseCache or None
+        The cache to use. Pass in None to disable caching entirely.
+    """
+    global _cache, _caching_enabled
+    with _lock:
+        _cache = cache
+        _caching_enabled = cache is not None
@@ -0,0 +1,199 @@
+"""Pluggable strategies for looking up the textures of heads that were
+specified by player name alone"""
+
+import json
+from abc import ABC, abstractmethod
+from os import PathLike
+from typing import Iterable
+
+from . import HeadSpec
+
+
+class TextureResolver(ABC):
+    """Base class for anything that can look up a player's skin"""
+
+    @abstractmethod
+    def get_texture(self, player_name: str) -> str | None:
+        """Look up a player's skin
+
+        Parameters
+        ----------
+        player_name : str
+            The player's username (or UUID, if the resolver supports it)
+
+        Returns
+        -------
+        str or None
+            The player's skin, encoded in base64, or None if the head should
+            be left to fetch its texture dynamically in-game
+
+        Raises
+        ------
+        ValueError
+            If no player with that name can be found
+        RuntimeError
+            If anything else goes wrong
+        """
+
+    def get_uuid(self, player_name: str) -> str | None:
+        """Look up a player's UUID (so that it can be recorded alongside their
+        skin)
+
+        Parameters
+        ----------
+        player_name : str
+            The player's username
+
+        Returns
+        -------
+        str or None
+            The player's UUID, or None if this resolver doesn't know it
+        """
+        return None
+
+
+class MojangResolver(TextureResolver):
+    """Look up skins live from the Mojang API (this is what's used by default)
+
+    Parameters
+    ----------
+    force_refresh : bool, optional
+        By default, lookups will be served from the on-disk cache whenever
+        possible. Pass in `force_refresh=True` to always query the Mojang API.
+        See: `head_hunter.mojang.get_players_current_skin()`
+    """
+
+    def __init__(self, force_refresh: bool = False):
+        self.force_refresh = force_refresh
+
+    def get_texture(self, player_name: str) -> str:
+        from head_hunter import mojang
+
+        return mojang.get_players_current_skin(
+            player_name, force_refresh=self.force_refresh
+        )
+
+    def get_uuid(self, player_name: str) -> str | None:
+        from head_hunter import mojang
+
+        # fetching the skin stored the UUID in the cache (and without a cache,
+        # looking it up again would cost another request)
+        if (cache := mojang.get_cache()) is None:
+            return None
+        return cache.get_uuid(player_name)
+
+
+class SnapshotResolver(TextureResolver):
+    """Look up skins from a local snapshot file (such as one written by
+    `export_snapshot()`) without touching the network
+
+    Parameters
+    ----------
+    snapshot_path : path
+        The snapshot file to load. This should be a JSON Lines file where each
+        line is an object with a "texture" field and a "player_name" and / or
+        "uuid" field.
+    strict : bool, optional
+        By default, asking for a player who isn't in the snapshot will raise
+        a `ValueError`. Pass in `strict=False` to instead leave that head's
+        texture to be fetched dynamically in-game.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the snapshot file doesn't exist
+    ValueError
+        If the snapshot file is not valid
+    """
+
+    def __init__(self, snapshot_path: str | PathLike, strict: bool = True):
+        self.strict = strict
+        self._textures: dict[str, str] = {}
+        self._uuids: dict[str, str] = {}
+        self._players: set[tuple[str, str]] = set()
+        with open(snapshot_path, encoding="utf-8") as snapshot_file:
+            for line_num, line in enumerate(snapshot_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    player_name = (entry.get("player_name") or "").lower()
+                    uuid = (entry.get("uuid") or "").lower()
+                    for key in (player_name, uuid):
+                        if key:
+                            self._textures[key] = entry["texture"]
+                    if player_name and uuid:
+                        self._uuids[player_name] = entry["uuid"]
+                    if player_name or uuid:
+                        self._players.add((player_name, uuid))
+                except (json.JSONDecodeError, KeyError, AttributeError) as bad_line:
+                    raise ValueError(
+                        f"Could not parse line {line_num} of {snapshot_path}:"
+                        f"\n\n{line}"
+                    ) from bad_line
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get_texture(self, player_name: str) -> str | None:
+        try:
+            return self._textures[player_name.lower()]
+        except KeyError:
+            if self.strict:
+                raise ValueError(f"{player_name} is not in the snapshot")
+            return None
+
+    def get_uuid(self, player_name: str) -> str | None:
+        return self._uuids.get(player_name.lower())
+
+
+def export_snapshot(
+    heads: Iterable[HeadSpec],
+    snapshot_path: str | PathLike,
+    resolver: TextureResolver | None = None,
+) -> int:
+    """Resolve the textures of all heads that were specified by player name
+    alone and save them to a snapshot file that can later be loaded by a
+    `SnapshotResolver`
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec
+        The heads to snapshot. Heads that already have a texture (or that
+        have no player name) will be skipped.
+    snapshot_path : path
+        Where to save the snapshot. Any existing file at this location will
+        be overwritten. Each player's UUID will be saved along with their skin
+        whenever the resolver knows it.
+    resolver : TextureResolver, optional
+        The resolver to use to look up textures. If None is provided, textures
+        will be pulled from the Mojang API.
+
+    Returns
+    -------
+    int
+        The number of players written to the snapshot
+
+    Raises
+    ------
+    ValueError
+        If any player can't be found
+    RuntimeError
+        If anything else goes wrong
+    """
+    resolver = resolver or MojangResolver()
+    snapshotted: set[str] = set()
+    with open(snapshot_path, "w", encoding="utf-8") as snapshot_file:
+        for head in heads:
+            if head.texture is not None or not head.player_name:
+                continue
+            if head.player_name.lower() in snapshotted:
+                continue
+            if (texture := resolver.get_texture(head.player_name)) is None:
+                continue
+            entry = {"player_name": head.player_name, "texture": texture}
+            if (uuid := resolver.get_uuid(head.player_name)) is not None:
+                entry["uuid"] = uuid
+            snapshot_file.write(json.dumps(entry) + "\n")
+            snapshotted.add(head.player_name.lower())
+    return len(snapshotted)
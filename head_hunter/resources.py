@@ -0,0 +1,278 @@
+"""Utilities for locating resources (functions, loot tables...) inside of a
+data pack, regardless of which version of the game the pack was written for"""
+
+import json
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, NamedTuple
+
+from .extract import PackInfo, get_pack_index, list_pack_files, open_pack_file
+
+# folder names that were singularized in Minecraft 1.21 (pack format 45)
+_LEGACY_KINDS = {
+    kind + "s": kind
+    for kind in (
+        "advancement",
+        "function",
+        "item_modifier",
+        "loot_table",
+        "predicate",
+        "recipe",
+        "structure",
+        "tags/block",
+        "tags/entity_type",
+        "tags/fluid",
+        "tags/function",
+        "tags/game_event",
+        "tags/item",
+    )
+}
+
+# kinds whose folders are nested one level deeper (e.g. "tags/function")
+_NESTED_KINDS = ("tags", "worldgen")
+
+_EXTENSIONS = {"function": ".mcfunction", "structure": ".nbt"}
+
+
+class ResourceLocation(NamedTuple):
+    """The logical location of a resource inside of a data pack, independent
+    of how the pack's folders are spelled
+
+    Attributes
+    ----------
+    namespace : str
+        The resource's namespace, e.g. "minecraft"
+    kind : str
+        The type of resource, e.g. "function", "loot_table" or "tags/item",
+        using the folder names from Minecraft 1.21 onwards
+    name : str
+        The resource's path within that namespace and kind, without the file
+        extension, e.g. "entities/zombie"
+    """
+
+    namespace: str
+    kind: str
+    name: str
+
+
+def _normalize_kind(kind: str) -> str:
+    """Translate a pre-1.21 folder name into the current one"""
+    return _LEGACY_KINDS.get(kind, kind)
+
+
+class PackResources(Mapping[ResourceLocation, str]):
+    """Mapping of every resource in a data pack to where it's stored in the
+    pack
+
+    Parameters
+    ----------
+    pack : path
+        The data pack (zipped or not)
+    files : list of str
+        The location of every file in the pack (as "/"-delimited paths
+        relative to the pack root). Use `PackResources.from_pack()` to list
+        these automatically.
+    pack_format : int, optional
+        The pack's format version, if known
+
+    Notes
+    -----
+    - Folders from before Minecraft 1.21 (e.g. "functions" rather than
+      "function") are recognized. If a pack has the same resource under both
+      spellings, the current spelling wins.
+    - Values are the location of each resource within the pack, suitable for
+      passing into `head_hunter.extract.open_pack_file()`.
+    """
+
+    def __init__(
+        self, pack: str | PathLike, files: Iterable[str], pack_format: int | None = None
+    ):
+        self.pack = Path(pack)
+        self.files = frozenset(files)
+        self.pack_format = pack_format
+        self.legacy_folders = False
+        self._locations: dict[ResourceLocation, str] = {}
+        self._modern: set[ResourceLocation] = set()
+        for file in self.files:
+            parts = file.split("/")
+            if len(parts) < 4 or parts[0] != "data" or not parts[-1]:
+                continue
+            depth = 4 if parts[2] in _NESTED_KINDS else 3
+            if len(parts) <= depth:
+                continue
+            folder = "/".join(parts[2:depth])
+            kind = _normalize_kind(folder)
+            name = "/".join(parts[depth:])
+            extension = _EXTENSIONS.get(kind, ".json")
+            if not name.endswith(extension):
+                continue
+            location = ResourceLocation(parts[1], kind, name[: -len(extension)])
+            if folder == kind:
+                self._locations[location] = file
+                self._modern.add(location)
+            else:
+                self.legacy_folders = True
+                if location not in self._modern:
+                    self._locations[location] = file
+
+        self._by_kind: dict[tuple[str, str], list[ResourceLocation]] = {}
+        for location in sorted(self._locations):
+            self._by_kind.setdefault((location.namespace, location.kind), []).append(
+                location
+            )
+
+    @classmethod
+    def from_pack(cls, pack: str | PathLike) -> "PackResources":
+        """Index the resources in a data pack
+
+        Parameters
+        ----------
+        pack : path
+            The data pack (zipped or not)
+
+        Returns
+        -------
+        PackResources
+            The pack's resources
+
+        Raises
+        ------
+        FileNotFoundError
+            If the pack doesn't exist
+        """
+        files = list_pack_files(pack)
+        pack_format: int | None = None
+        if "pack.mcmeta" in files:
+            try:
+                with open_pack_file(pack, "pack.mcmeta") as mcmeta:
+                    pack_format = int(json.load(mcmeta)["pack"]["pack_format"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        return cls(pack, files, pack_format)
+
+    def __getitem__(self, location: ResourceLocation) -> str:
+        return self._locations[location]
+
+    def __iter__(self) -> Iterator[ResourceLocation]:
+        return iter(self._locations)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def resolve(self, namespace: str, kind: str, name: str) -> str:
+        """Find where a resource is stored in the pack
+
+        Parameters
+        ----------
+        namespace : str
+            The resource's namespace, e.g. "wandering_trades"
+        kind : str
+            The type of resource, e.g. "function" (pre-1.21 spellings,
+            like "functions", are also accepted)
+        name : str
+            The resource's path within that namespace and kind, without the
+            file extension, e.g. "add_trade"
+
+        Returns
+        -------
+        str
+            The location of the resource within the pack (as a "/"-delimited
+            path relative to the pack root)
+
+        Raises
+        ------
+        KeyError
+            If the pack does not contain the resource
+        """
+        location = ResourceLocation(namespace, _normalize_kind(kind), name)
+        try:
+            return self._locations[location]
+        except KeyError:
+            raise KeyError(f"{self.pack} does not contain {location}") from None
+
+    def namespaces(self) -> list[str]:
+        """List the namespaces that contain resources
+
+        Returns
+        -------
+        list of str
+            The namespaces, sorted alphabetically
+        """
+        return sorted({namespace for namespace, _ in self._by_kind})
+
+    def list_resources(
+        self, kind: str, namespace: str | None = None, prefix: str = ""
+    ) -> list[ResourceLocation]:
+        """List every resource of a given type, e.g. all functions in a
+        namespace
+
+        Parameters
+        ----------
+        kind : str
+            The type of resource, e.g. "function"
+        namespace : str, optional
+            Only list resources in this namespace. By default, resources from
+            all namespaces will be returned.
+        prefix : str, optional
+            Only list resources whose names start with this, e.g. "entities/"
+
+        Returns
+        -------
+        list of ResourceLocation
+            The matching resources, sorted by namespace then name
+        """
+        kind = _normalize_kind(kind)
+        namespaces = self.namespaces() if namespace is None else [namespace]
+        return [
+            location
+            for each_namespace in namespaces
+            for location in self._by_kind.get((each_namespace, kind), ())
+            if location.name.startswith(prefix)
+        ]
+
+
+_cached_resources: dict[Path, tuple[PackInfo, PackResources]] = {}
+_lock = threading.Lock()
+
+
+def get_pack_resources(
+    pack_name: str, pack_directory: str | PathLike | None = None
+) -> PackResources:
+    """Get the resources of a specific data pack
+
+    Parameters
+    ----------
+    pack_name : str
+        Which data pack you want (not case-sensitive, and after normalizing
+        for spaces, underscores and dashes)
+    pack_directory : path, optional
+        The pack directory to search. If None is given, this method will look
+        for a "packs" folder inside the current working directory.
+
+    Returns
+    -------
+    PackResources
+        The pack's resources
+
+    Raises
+    ------
+    KeyError
+        If no matching packs can be found
+
+    Notes
+    -----
+    The resources of zipped packs are remembered until the pack changes. The
+    files in unzipped packs are re-listed with each call.
+    """
+    pack = get_pack_index(pack_directory).get(pack_name)
+    if not pack.is_zipped:
+        return PackResources.from_pack(pack.path)
+    with _lock:
+        cached = _cached_resources.get(pack.path)
+    if cached is not None and cached[0] == pack:
+        return cached[1]
+    resources = PackResources.from_pack(pack.path)
+    with _lock:
+        _cached_resources[pack.path] = (pack, resources)
+    return resources
@@ -0,0 +1,325 @@
+"""Utilities for quickly checking whether a head list already has a head for
+a given name"""
+
+import bisect
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from os import PathLike
+from pathlib import Path
+from typing import Iterable
+
+from . import HeadSpec, iter_loads
+
+INDEX_VERSION = 1
+
+_SEARCH_FIELDS = ("name", "player_name", "comment")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Normalize a string (lowercase, without accents or punctuation) and split
+    it into words
+
+    Parameters
+    ----------
+    text : str
+        The string to tokenize
+
+    Returns
+    -------
+    list of str
+        The normalized tokens
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return re.findall(
+        r"[^\W_]+",
+        "".join(char for char in decomposed if not unicodedata.combining(char)),
+    )
+
+
+def _trigrams(token: str) -> set[str]:
+    """Split a token into overlapping three-character chunks (padded so that
+    short tokens still have some)"""
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class HeadIndex:
+    """Search index over the names, player names and comments in a head list
+
+    Parameters
+    ----------
+    heads : list-like of HeadSpec, optional
+        The heads to index. Search results are reported as positions in this
+        list.
+
+    Notes
+    -----
+    - All queries are case-insensitive and ignore accents, punctuation and
+      word order.
+    - Words are kept in a sorted array, which serves as a compact prefix
+      trie: prefix queries are a binary search followed by a scan over the
+      matching words.
+    """
+
+    def __init__(self, heads: Iterable[HeadSpec] = ()):
+        self.metadata: dict[str, str | int | float] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._head_count = 0
+        self._sorted_tokens: list[str] = []
+        self._trigram_index: dict[str, list[str]] = {}
+        self._trigram_counts: dict[str, int] = {}
+        self._stale = False
+        for head in heads:
+            self.add(head)
+
+    def __len__(self) -> int:
+        return self._head_count
+
+    def add(self, head: HeadSpec) -> int:
+        """Add a head to the index
+
+        Parameters
+        ----------
+        head : HeadSpec
+            The head to add
+
+        Returns
+        -------
+        int
+            The position assigned to that head
+        """
+        position = self._head_count
+        for field in _SEARCH_FIELDS:
+            if value := getattr(head, field):
+                for token in _tokenize(value):
+                    self._postings.setdefault(token, set()).add(position)
+        self._head_count += 1
+        self._stale = True
+        return position
+
+    def exact(self, query: str) -> list[int]:
+        """Find the heads containing every word in the query
+
+        Parameters
+        ----------
+        query : str
+            The words to search for
+
+        Returns
+        -------
+        list of int
+            The positions of the matching heads, in order
+        """
+        return self._match_all(
+            self._postings.get(token, set()) for token in _tokenize(query)
+        )
+
+    def prefix(self, query: str) -> list[int]:
+        """Find the heads containing a word starting with each word in the
+        query (so "pan" will match "Panda" and "Pancake")
+
+        Parameters
+        ----------
+        query : str
+            The word prefixes to search for
+
+        Returns
+        -------
+        list of int
+            The positions of the matching heads, in order
+        """
+        return self._match_all(
+            set().union(*(self._postings[token] for token in self._completions(start)))
+            for start in _tokenize(query)
+        )
+
+    def fuzzy(
+        self, query: str, threshold: float = 0.5, limit: int | None = 10
+    ) -> list[tuple[int, float]]:
+        """Find the heads whose words most closely resemble the words in the
+        query, allowing for typos
+
+        Parameters
+        ----------
+        query : str
+            The words to search for
+        threshold : float, optional
+            The minimum similarity (0 to 1, based on the fraction of shared
+            three-letter chunks) for a word to count as a match. Default is 0.5.
+        limit : int or None, optional
+            The maximum number of results to return. Default is 10. Pass in
+            None to return all matches.
+
+        Returns
+        -------
+        list of (int, float) tuples
+            The positions of the matching heads, along with their scores (the
+            average similarity across all words in the query), best first
+        """
+        self._refresh()
+        query_tokens = _tokenize(query)
+        scores: Counter[int] = Counter()
+        for query_token in query_tokens:
+            query_trigrams = _trigrams(query_token)
+            overlaps: Counter[str] = Counter()
+            for trigram in query_trigrams:
+                overlaps.update(self._trigram_index.get(trigram, ()))
+            best: dict[int, float] = {}
+            for token, overlap in overlaps.items():
+                similarity = (
+                    2 * overlap / (len(query_trigrams) + self._trigram_counts[token])
+                )
+                if similarity < threshold:
+                    continue
+                for position in self._postings[token]:
+                    best[position] = max(best.get(position, 0.0), similarity)
+            scores.update(best)
+        return [
+            (position, score / len(query_tokens))
+            for position, score in sorted(
+                scores.items(), key=lambda result: (-result[1], result[0])
+            )[:limit]
+        ]
+
+    def save(self, index_path: str | PathLike, **metadata: str | int | float) -> None:
+        """Save this index to file so that it can be re-loaded later without
+        needing to be rebuilt
+
+        Parameters
+        ----------
+        index_path : path
+            Where to save the index. Any existing file at this location will
+            be overwritten.
+        **metadata
+            Any additional information to store alongside the index
+            (for example, to be able to tell whether it's out of date)
+        """
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "head_count": self._head_count,
+                    "metadata": metadata,
+                    "postings": {
+                        token: sorted(positions)
+                        for token, positions in self._postings.items()
+                    },
+                },
+                index_file,
+            )
+
+    @classmethod
+    def load(cls, index_path: str | PathLike) -> "HeadIndex":
+        """Load an index saved by `save()`
+
+        Parameters
+        ----------
+        index_path : path
+            The saved index
+
+        Returns
+        -------
+        HeadIndex
+            The loaded index
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified file doesn't exist
+        ValueError
+            If the specified file is not a valid (or is an outdated) index
+        """
+        with open(index_path, encoding="utf-8") as index_file:
+            try:
+                saved = json.load(index_file)
+            except json.JSONDecodeError as bad_file:
+                raise ValueError(f"{index_path} is not a valid index") from bad_file
+        if not isinstance(saved, dict) or saved.get("version") != INDEX_VERSION:
+            raise ValueError(f"{index_path} is not a valid index")
+        index = cls()
+        try:
+            index._head_count = saved["head_count"]
+            index._postings = {
+                token: set(positions) for token, positions in saved["postings"].items()
+            }
+            index.metadata = saved["metadata"]
+        except (KeyError, TypeError, AttributeError) as bad_index:
+            raise ValueError(f"{index_path} is not a valid index") from bad_index
+        if not isinstance(index._head_count, int) or not isinstance(
+            index.metadata, dict
+        ):
+            raise ValueError(f"{index_path} is not a valid index")
+        index._stale = True
+        return index
+
+    @classmethod
+    def for_head_list(cls, head_list_path: str | PathLike) -> "HeadIndex":
+        """Get the index for a head list written by `head_hunter.dump()`,
+        loading it from alongside the head list if it's been saved before (and
+        the head list hasn't changed since), and building and saving it
+        otherwise
+
+        Parameters
+        ----------
+        head_list_path : path
+            The head list to index. The index will be saved as a file with the
+            same name plus an ".index.json" suffix.
+
+        Returns
+        -------
+        HeadIndex
+            The index for that head list
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified head list doesn't exist
+        """
+        head_list_path = Path(head_list_path)
+        index_path = head_list_path.with_name(head_list_path.name + ".index.json")
+        stat = os.stat(head_list_path)
+        try:
+            index = cls.load(index_path)
+            if index.metadata == {"size": stat.st_size, "mtime": stat.st_mtime}:
+                return index
+        except (FileNotFoundError, ValueError):
+            pass
+        with open(head_list_path, encoding="utf-8") as head_list:
+            index = cls(iter_loads(head_list))
+        index.save(index_path, size=stat.st_size, mtime=stat.st_mtime)
+        return index
+
+    def _refresh(self) -> None:
+        """(Re)build the structures used for prefix and fuzzy lookups if any
+        heads have been added since they were last built"""
+        if not self._stale:
+            return
+        self._sorted_tokens = sorted(self._postings)
+        self._trigram_index = {}
+        self._trigram_counts = {}
+        for token in self._sorted_tokens:
+            trigrams = _trigrams(token)
+            self._trigram_counts[token] = len(trigrams)
+            for trigram in trigrams:
+                self._trigram_index.setdefault(trigram, []).append(token)
+        self._stale = False
+
+    def _completions(self, start: str) -> list[str]:
+        """Get every indexed word beginning with the given prefix"""
+        self._refresh()
+        first = bisect.bisect_left(self._sorted_tokens, start)
+        last = bisect.bisect_left(self._sorted_tokens, start + "\U0010ffff", first)
+        return self._sorted_tokens[first:last]
+
+    @staticmethod
+    def _match_all(candidates: Iterable[set[int]]) -> list[int]:
+        """Intersect the positions matching each word in a query"""
+        matches: set[int] | None = None
+        for positions in candidates:
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return []
+        return sorted(matches or ())
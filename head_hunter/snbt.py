@@ -0,0 +1,226 @@
+"""A parser for SNBT ("stringified NBT"), the syntax used to specify item and
+entity data inside of Minecraft commands"""
+
+import re
+from typing import Any
+
+_DOUBLE_QUOTED = r'"([^"\\]*(?:\\.[^"\\]*)*)"'
+_SINGLE_QUOTED = r"'([^'\\]*(?:\\.[^'\\]*)*)'"
+_OPENER = r"(\{|\[(?:\s*[BIL]\s*;)?)"
+
+# Rather than matching one token at a time, each match consumes a whole
+# element: an optional key (plus colon), then a value (or the opening bracket
+# of a compound or list), then any commas and closing brackets that follow.
+# Unquoted keys can't contain colons in-game, but some packs namespace their
+# keys anyway (e.g. `minecraft:item_name:...`), so an unquoted word followed by
+# a colon takes everything up to the last colon that's followed by a value.
+_ELEMENT = re.compile(
+    rf"\s*(?:{_OPENER}|{_DOUBLE_QUOTED}|{_SINGLE_QUOTED}"
+    r"|([\w.+\-]+(?::[\w.+\-]+)*(?=\s*:)|[\w.+\-]+))"
+    rf"(?:\s*:\s*(?:{_OPENER}|{_DOUBLE_QUOTED}|{_SINGLE_QUOTED}|([\w.+\-]+)))?"
+    r"((?:\s*[,}\]])*)\s*",
+    re.DOTALL,
+)
+_NUMBER = re.compile(r"([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)([bBsSlLfFdD]?)")
+_ESCAPE = re.compile(r"\\(u[0-9A-Fa-f]{4}|.)", re.DOTALL)
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+_BOOLEANS = {"true": True, "false": False}
+
+
+class SNBTDecodeError(ValueError):
+    """Raised when a string can't be parsed as SNBT
+
+    Attributes
+    ----------
+    snbt : str
+        The string being parsed
+    pos : int
+        The position in the string where parsing failed
+    """
+
+    def __init__(self, message: str, snbt: str, pos: int):
+        super().__init__(f"{message} (at position {pos}): {snbt[pos:pos + 40]!r}")
+        self.snbt = snbt
+        self.pos = pos
+
+
+def loads(snbt: str) -> Any:
+    """Parse an SNBT value
+
+    Parameters
+    ----------
+    snbt : str
+        The value to parse, e.g. `{id:"minecraft:emerald",Count:1b}`
+
+    Returns
+    -------
+    Any
+        The parsed value. Compounds are parsed as dicts, lists and arrays as
+        lists, quoted and unquoted strings as strs, `true` and `false` as
+        bools, and numbers as ints or floats (type suffixes, such as the "b"
+        in "1b", are validated but discarded).
+
+    Raises
+    ------
+    SNBTDecodeError
+        If the string is not a single valid SNBT value
+    """
+    value, end = decode(snbt)
+    if snbt[end:].strip():
+        raise SNBTDecodeError("Unexpected data after value", snbt, end)
+    return value
+
+
+def decode(snbt: str, start: int = 0) -> tuple[Any, int]:
+    """Parse the SNBT value beginning at a given position in a string,
+    ignoring anything that comes after it (so that values can be pulled
+    straight out of a longer command)
+
+    Parameters
+    ----------
+    snbt : str
+        The string containing the value
+    start : int, optional
+        Where in the string the value starts (leading whitespace is skipped).
+        Default is 0.
+
+    Returns
+    -------
+    Any
+        The parsed value (see: `loads()`)
+    int
+        The position in the string immediately after the end of the value
+
+    Raises
+    ------
+    SNBTDecodeError
+        If no valid SNBT value starts at the specified position
+
+    Notes
+    -----
+    The string is parsed in a single left-to-right pass, keeping an explicit
+    stack of the compounds and lists that are still open (so there's no limit
+    on how deeply values can be nested)
+    """
+    # the compounds and lists that are still open (other than the innermost),
+    # along with the key each will be stored under once it's closed
+    stack: list[tuple[Any, bool, str | None]] = []
+    container: Any = None  # the innermost open compound or list
+    in_compound = False
+    key: str | None = None
+    pos = start
+    expecting_comma = False
+    match = _ELEMENT.match
+    while True:
+        element = match(snbt, pos)
+        if element is None:
+            raise SNBTDecodeError("Expected a value", snbt, pos)
+        if expecting_comma:
+            raise SNBTDecodeError("Expected ',' or closing bracket", snbt, pos)
+        (
+            opener,
+            double_quoted,
+            single_quoted,
+            word,
+            value_opener,
+            value_double_quoted,
+            value_single_quoted,
+            value_word,
+            closers,
+        ) = element.groups()
+
+        if (
+            value_opener
+            or value_word
+            or value_double_quoted is not None
+            or value_single_quoted is not None
+        ):
+            if not in_compound or opener:
+                raise SNBTDecodeError("Unexpected key", snbt, pos)
+            key = word or _unquote(double_quoted, single_quoted)
+            opener, double_quoted, single_quoted, word = (
+                value_opener,
+                value_double_quoted,
+                value_single_quoted,
+                value_word,
+            )
+        elif in_compound:
+            raise SNBTDecodeError("Expected a key", snbt, pos)
+
+        if opener:
+            if container is not None:
+                stack.append((container, in_compound, key))
+            in_compound = opener == "{"
+            container = {} if in_compound else []
+        else:
+            try:
+                value = (
+                    _parse_word(word)
+                    if word
+                    else _unquote(double_quoted, single_quoted)
+                )
+            except ValueError as bad_value:
+                raise SNBTDecodeError(str(bad_value), snbt, pos) from None
+            if container is None:
+                return value, element.start(9)
+            if in_compound:
+                container[key] = value
+            else:
+                container.append(value)
+            expecting_comma = True
+
+        pos = element.end()
+        if closers == ",":  # by far the most common case
+            if not expecting_comma:
+                raise SNBTDecodeError("Unexpected ','", snbt, element.start(9))
+            expecting_comma = False
+            continue
+        for offset, char in enumerate(closers, element.start(9)):
+            if char == ",":
+                if not expecting_comma:
+                    raise SNBTDecodeError("Unexpected ','", snbt, offset)
+                expecting_comma = False
+            elif char == "}" or char == "]":
+                if (char == "}") != in_compound:
+                    raise SNBTDecodeError(f"Unexpected '{char}'", snbt, offset)
+                if not stack:
+                    return container, offset + 1
+                value = container
+                container, in_compound, key = stack.pop()
+                if in_compound:
+                    container[key] = value
+                else:
+                    container.append(value)
+                expecting_comma = True
+
+
+def _parse_word(word: str) -> Any:
+    """Parse an unquoted value (number, boolean or string)"""
+    if word[0] in "0123456789+-." and (matched := _NUMBER.fullmatch(word)):
+        number, suffix = matched.groups()
+        if suffix:
+            is_float = suffix in "fFdD"
+        else:
+            is_float = "." in number or "e" in number or "E" in number
+        if is_float:
+            return float(number)
+        try:
+            return int(number)
+        except ValueError:
+            raise ValueError(f"{word} is not a valid integer") from None
+    return _BOOLEANS.get(word, word)
+
+
+def _unquote(double_quoted: str | None, single_quoted: str | None) -> str:
+    """Process the escape sequences in a quoted string"""
+    value = single_quoted if double_quoted is None else double_quoted
+    if value and "\\" in value:
+        value = _ESCAPE.sub(_unescape, value)
+    return value or ""
+
+
+def _unescape(escape: re.Match) -> str:
+    code = escape.group(1)
+    if len(code) == 5:
+        return chr(int(code[1:], 16))
+    return _ESCAPES.get(code, code)
@@ -0,0 +1,359 @@
+"""Utilities for keeping track of the data packs in a pack directory while
+packs are being added, replaced and removed"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+import warnings
+from os import PathLike
+from pathlib import Path
+from types import TracebackType
+from typing import Callable, NamedTuple
+
+from .extract import PackIndex, PackInfo
+from .parse import ParsedHead, parse_packs
+
+# see: man 7 inotify
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_IGNORED = 0x8000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+# the events that mean the watch on the pack directory itself is gone
+_WATCH_LOST = _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED
+
+# struct inotify_event {int wd; uint32_t mask, cookie, len; char name[];}
+_EVENT_HEADER = struct.Struct("iIII")
+
+# how long to wait for a burst of file system events (such as a pack being
+# copied in) to die down before rescanning
+_SETTLE_TIME = 0.05
+
+
+class PackEvent(NamedTuple):
+    """A change to the packs in a pack directory
+
+    Attributes
+    ----------
+    change : str
+        One of "added", "changed" or "removed"
+    pack : PackInfo
+        The pack that changed (for removed packs, this is the last that was
+        known about the pack)
+    """
+
+    change: str
+    pack: PackInfo
+
+
+class PackWatcher:
+    """Keeps an up-to-date index of the data packs in a pack directory (and of
+    the heads in each pack), notifying listeners whenever packs are added,
+    replaced or removed
+
+    Parameters
+    ----------
+    pack_directory : path, optional
+        The pack directory to watch. If None is given, this will watch the
+        "packs" folder inside the current working directory.
+    poll_interval : float, optional
+        How often (in seconds) to rescan the pack directory when file system
+        notifications aren't available. Default is 1 second.
+    use_inotify : bool, optional
+        By default, changes are picked up via inotify where the operating
+        system supports it, falling back to polling otherwise. Pass in
+        `use_inotify=False` to always poll.
+
+    Notes
+    -----
+    - Watching only starts once `start()` is called (or when this is used as
+      a context manager). `check()` can be called at any time to pick up
+      changes immediately.
+    - Listeners are called from whichever thread picked up the change
+      (usually the watcher's background thread), one event at a time and in
+      the order the changes were detected. A listener must not itself call
+      `check()`.
+    - If the pack directory is deleted or moved away, the watcher falls
+      back to polling until the directory reappears, at which point it
+      resumes watching it via inotify.
+    - Only the pack directory itself is watched, so edits made deep inside
+      an unzipped pack are only noticed if they change the pack folder's
+      own modification time.
+    - The heads in each pack are only parsed the first time they're
+      requested, and are forgotten as soon as the pack changes.
+    """
+
+    def __init__(
+        self,
+        pack_directory: str | PathLike | None = None,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ):
+        self.pack_directory = Path(
+            "packs" if pack_directory is None else pack_directory
+        )
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._index = PackIndex(self.pack_directory)
+        self._listeners: list[Callable[[PackEvent], None]] = []
+        self._lock = threading.RLock()
+        # held while computing and delivering events, so that listeners see
+        # every change exactly once and in order
+        self._dispatch_lock = threading.Lock()
+        self._packs = {pack.path: pack for pack in self._index.refresh()}
+        self._heads: dict[Path, tuple[PackInfo, list[ParsedHead]]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def packs(self) -> list[PackInfo]:
+        """The data packs currently in the pack directory, sorted lexically
+        (alphabetically)"""
+        with self._lock:
+            return sorted(self._packs.values())
+
+    def add_listener(self, listener: Callable[[PackEvent], None]) -> None:
+        """Register a function to be called whenever a pack is added, changed
+        or removed
+
+        Parameters
+        ----------
+        listener : function
+            The function to call. It will be passed the `PackEvent` describing
+            what changed (and will be called once per pack that changed).
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[PackEvent], None]) -> None:
+        """Stop calling a previously registered function
+
+        Parameters
+        ----------
+        listener : function
+            The function to stop calling
+
+        Raises
+        ------
+        ValueError
+            If the function was never registered
+        """
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def heads(self, pack: str | PathLike) -> list[ParsedHead]:
+        """Get every head from every trade function and mob loot table in one
+        of the watched packs
+
+        Parameters
+        ----------
+        pack : path
+            The data pack
+
+        Returns
+        -------
+        list of ParsedHead
+            Every head found in the pack, in order (see:
+            `head_hunter.parse.parse_packs()`). Files that can't be parsed are
+            skipped with a warning.
+
+        Raises
+        ------
+        KeyError
+            If the pack isn't one of the packs being watched
+        """
+        path = Path(pack)
+        if path.parent != self.pack_directory:
+            path = self.pack_directory / path.name
+        with self._lock:
+            info = self._packs[path]
+            if (cached := self._heads.get(path)) is not None and cached[0] == info:
+                return cached[1]
+        heads = parse_packs([path], max_workers=1, strict=False)
+        with self._lock:
+            if self._packs.get(path) == info:
+                self._heads[path] = (info, heads)
+        return heads
+
+    def check(self) -> list[PackEvent]:
+        """Rescan the pack directory, notifying listeners of anything that's
+        changed since the last scan
+
+        Returns
+        -------
+        list of PackEvent
+            Everything that's changed since the last scan
+        """
+        with self._dispatch_lock:
+            with self._lock:
+                current = {pack.path: pack for pack in self._index.refresh()}
+                events: list[PackEvent] = []
+                for path, pack in sorted(current.items()):
+                    if (previous := self._packs.get(path)) is None:
+                        events.append(PackEvent("added", pack))
+                    elif previous != pack:
+                        events.append(PackEvent("changed", pack))
+                for path in sorted(self._packs.keys() - current.keys()):
+                    events.append(PackEvent("removed", self._packs[path]))
+                for event in events:
+                    if event.change != "added":
+                        self._heads.pop(event.pack.path, None)
+                self._packs = current
+                listeners = list(self._listeners)
+
+            # listeners are called outside of the main lock so that they're
+            # free to look up packs and heads
+            for event in events:
+                for listener in listeners:
+                    try:
+                        listener(event)
+                    except Exception as oops:
+                        warnings.warn(
+                            f"Error notifying {listener} of {event}:\n{oops!r}",
+                            RuntimeWarning,
+                        )
+        return events
+
+    def start(self) -> None:
+        """Start watching the pack directory (in a background thread)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            inotify_fd = (
+                _start_inotify(self.pack_directory) if self.use_inotify else None
+            )
+            self._thread = threading.Thread(
+                target=self._watch,
+                args=(inotify_fd,),
+                name=f"PackWatcher({self.pack_directory})",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the pack directory"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def __enter__(self) -> "PackWatcher":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _watch(self, inotify_fd: int | None) -> None:
+        """Watch the pack directory for changes, via inotify if a watch was
+        set up (and for as long as that watch lasts), polling otherwise"""
+        retry_inotify = inotify_fd is not None
+        while not self._stop.is_set():
+            if inotify_fd is not None:
+                self._notify(inotify_fd)
+                inotify_fd = None
+            elif not self._stop.wait(self.poll_interval):
+                if retry_inotify:
+                    # only succeeds once the pack directory exists again
+                    inotify_fd = _start_inotify(self.pack_directory)
+                self.check()
+
+    def _notify(self, inotify_fd: int) -> None:
+        """Rescan the pack directory whenever the OS says something in it
+        has changed, until the watcher is stopped or the pack directory
+        itself is deleted or moved (closing the inotify file descriptor
+        either way)"""
+        try:
+            while not self._stop.is_set():
+                readable, _, _ = select.select([inotify_fd], [], [], 0.5)
+                if not readable:
+                    continue
+                # let the burst of events (e.g. from a pack being copied in)
+                # die down, then rescan once
+                events = 0
+                while readable:
+                    events |= _drain(inotify_fd)
+                    time.sleep(_SETTLE_TIME)
+                    readable, _, _ = select.select([inotify_fd], [], [], 0)
+                self.check()
+                if events & _WATCH_LOST:
+                    return
+        finally:
+            os.close(inotify_fd)
+
+
+def _start_inotify(directory: Path) -> int | None:
+    """Set up an inotify watch on a directory
+
+    Returns
+    -------
+    int or None
+        The inotify file descriptor, or None if inotify isn't available (or
+        the directory couldn't be watched)
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError, TypeError):
+        return None
+    inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    inotify_fd = inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if inotify_fd < 0:
+        return None
+    if inotify_add_watch(inotify_fd, os.fsencode(directory), _WATCH_MASK) < 0:
+        os.close(inotify_fd)
+        return None
+    return inotify_fd
+
+
+def _drain(inotify_fd: int) -> int:
+    """Read every pending inotify event
+
+    Returns
+    -------
+    int
+        The masks of all the events that were read, OR'd together
+    """
+    events = 0
+    try:
+        while buffer := os.read(inotify_fd, 65536):
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                events |= mask
+                offset += _EVENT_HEADER.size + name_length
+    except BlockingIOError:
+        pass
+    return events
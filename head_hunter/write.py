@@ -1,14 +1,22 @@
 """Utilities for writing / updating data pack files"""
 
 import datetime as dt
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from os import PathLike
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Generator, Iterable, Iterator
 
 from . import BLOCK_TRADE_FILENAME, HEAD_TRADE_FILENAME, PACK_FOLDER, HeadSpec
+from .resolve import MojangResolver, TextureResolver
 
 START_AT = 2
 
+# how many heads to look ahead when batching up Mojang API lookups
+_LOOKAHEAD = 100
+
 _NAMESPACE_DIR = PACK_FOLDER / "data" / "wandering_trades"
 
 
@@ -100,6 +108,8 @@ def write_head_trades(
     xp_bonus: int = 0,
     pack_format: int = 48,
     freeze_textures: bool = True,
+    max_workers: int = 1,
+    resolver: TextureResolver | None = None,
 ) -> tuple[int, int]:
     """Render the `add_trade.mcfunction` file that will give the
     Wandering Trader a specified list of head trades
@@ -138,6 +148,18 @@ def write_head_trades(
         from the Mojang API when this method is called. To disable this
         feature (for example, if you're running this on a computer without
         internet access), pass in `freeze_textures=False`.
+        The UUIDs of those players will be looked up in bulk ahead of
+        fetching their textures.
+    max_workers : int, optional
+        The number of threads to use for fetching textures. By default, heads
+        are rendered one at a time. Regardless of this setting, trades are
+        always written in the order they were provided, and all requests
+        to the Mojang API go through a shared rate limiter
+        (see: `head_hunter.mojang.set_rate_limiter()`).
+    resolver : TextureResolver, optional
+        Where to look up the textures to freeze. If None is provided,
+        textures will be fetched from the Mojang API. To build without
+        network access, pass in a `head_hunter.resolve.SnapshotResolver`.
 
     Returns
     -------
@@ -165,10 +187,92 @@ def write_head_trades(
     if price is None:
         price = ('"minecraft:emerald"', 1)
 
-    template_path = Path(__file__).parent / "templates" / "add_trade.mcfunction"
-
     function_dir = _NAMESPACE_DIR / ("function" if pack_format >= 48 else "functions")
 
+    header, (before_idx, before_spec, after_spec) = _compile_head_trade_template(
+        pack_format, tuple(price), purchase_limit, xp_bonus
+    )
+
+    # the trick here is that we want the bounds to be inclusive,
+    # so STARTS_AT should be the first written value, and trade_index
+    # should be the last
+    trade_index = START_AT - 1
+
+    trade_file_path = function_dir / HEAD_TRADE_FILENAME
+    # write to a scratch file so that a failure partway through doesn't
+    # clobber the existing trades
+    scratch_path = trade_file_path.with_name(f".{HEAD_TRADE_FILENAME}.tmp")
+
+    render = functools.partial(
+        _render_head,
+        pack_format=pack_format,
+        offline=not freeze_textures,
+        resolver=resolver,
+    )
+
+    # the Mojang-specific optimizations
+    live = freeze_textures and (
+        resolver is None or isinstance(resolver, MojangResolver)
+    )
+
+    try:
+        with (
+            _coalesced_lookups(live),
+            _render_map(max_workers) as render_all,
+            scratch_path.open("w") as trade_file,
+        ):
+            trade_file.write(header)
+            # Executor.map submits everything up front, so feed it a batch at a time
+            for batch in _batched(trades, _LOOKAHEAD):
+                if live:
+                    _pre_resolve_uuids(batch)
+                for head_spec in render_all(render, batch):
+                    trade_index += 1
+                    trade_file.write(
+                        f"{before_idx}{trade_index}{before_spec}{head_spec}{after_spec}"
+                    )
+        scratch_path.replace(trade_file_path)
+    finally:
+        scratch_path.unlink(missing_ok=True)
+
+    return START_AT, trade_index
+
+
+@functools.lru_cache
+def _compile_head_trade_template(
+    pack_format: int, price: tuple[str, int], purchase_limit: int, xp_bonus: int
+) -> tuple[str, tuple[str, str, str]]:
+    """Fill in everything in the head trade template that's the same for every
+    trade, so that each command can be rendered in a single pass
+
+    Parameters
+    ----------
+    pack_format : int
+        The data pack version
+    price : (str, int) tuple
+        The price of a head, structured in the form (item, quantity)
+    purchase_limit : int
+        The number of each head you can buy per trader
+    xp_bonus : int
+        The amount of XP you get from buying a player head
+
+    Returns
+    -------
+    str
+        The header for the trade function file
+    (str, str, str) tuple
+        The fixed parts of each trade command: everything before the trade
+        index, everything between the trade index and the head spec, and
+        everything after the head spec
+
+    Raises
+    ------
+    ValueError
+        If the template doesn't have exactly one trade index placeholder
+        followed by exactly one head spec placeholder
+    """
+    template_path = Path(__file__).parent / "templates" / "add_trade.mcfunction"
+
     with open(template_path) as template_file:
         template = template_file.readlines()
 
@@ -180,7 +284,6 @@ def write_head_trades(
 
     command_template = "".join(template[-2:])
 
-    commands = []
     for placeholder, value in (
         ("XP_BONUS", str(xp_bonus)),
         ("PURCHASE_LIMIT", str(purchase_limit)),
@@ -190,28 +293,96 @@ def write_head_trades(
     ):
         command_template = command_template.replace(placeholder, value)
 
-    # the trick here is that we want the bounds to be inclusive,
-    # so STARTS_AT should be the first written value, and trade_index
-    # should be the last
-    trade_index = START_AT - 1
+    match command_template.split("IDX"):
+        case [before_idx, after_idx]:
+            match after_idx.split("HEAD_SPEC"):
+                case [before_spec, after_spec]:
+                    return header, (before_idx, before_spec, after_spec)
+    raise ValueError(f"Could not compile head trade template:\n{command_template}")
+
+
+def _render_head(
+    head: HeadSpec,
+    pack_format: int,
+    offline: bool,
+    resolver: TextureResolver | None,
+) -> str:
+    """Render the specification of a single head for the given pack format"""
+    if pack_format >= 41:
+        return head.to_component_dict(offline=offline, resolver=resolver)
+    return head.to_player_head(
+        pack_format=pack_format, offline=offline, resolver=resolver
+    )
 
-    for head in trades:
-        head_spec = (
-            head.to_component_dict(offline=not freeze_textures)
-            if pack_format >= 41
-            else head.to_player_head(
-                pack_format=pack_format, offline=not freeze_textures
-            )
-        )
-        command = command_template.replace(
-            "IDX", str(trade_index := trade_index + 1)  # ++trade_index
-        ).replace("HEAD_SPEC", head_spec)
-        commands.append(command)
 
-    trade_file_path = function_dir / HEAD_TRADE_FILENAME
+def _batched(
+    heads: Iterable[HeadSpec], batch_size: int
+) -> Generator[list[HeadSpec], None, None]:
+    """Split a (potentially very long) stream of heads into lists of the
+    specified size (the last batch may be smaller)"""
+    head_iterator = iter(heads)
+    while batch := list(islice(head_iterator, batch_size)):
+        yield batch
 
-    trade_file_path.write_text("".join([*header, *commands]))
-    return START_AT, trade_index
+
+@contextmanager
+def _render_map(
+    max_workers: int,
+) -> Generator[Callable[..., Iterator[str]], None, None]:
+    """Provide a `map` that renders heads across a pool of threads or, if
+    only one worker is wanted, in-line (without starting a pool at all)"""
+    if max_workers <= 1:
+        yield map
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield pool.map
+
+
+@contextmanager
+def _coalesced_lookups(enabled: bool) -> Generator[None, None, None]:
+    """Share the results of Mojang API lookups across every head rendered in
+    this context (without importing the mojang module unless needed)"""
+    if not enabled:
+        yield
+        return
+
+    from head_hunter import mojang
+
+    with mojang.coalesce_lookups():
+        yield
+
+
+def _pre_resolve_uuids(batch: list[HeadSpec]) -> None:
+    """Warm the Mojang API cache with the UUIDs of any players whose textures
+    will need to be fetched in order to render the given heads
+
+    Parameters
+    ----------
+    batch : list of HeadSpec
+        The heads that are about to be rendered
+
+    Notes
+    -----
+    Lookup failures are ignored here: they'll get raised (with proper context)
+    when the offending head is actually rendered
+    """
+    from head_hunter import mojang
+
+    if mojang.get_cache() is None:
+        # nowhere to put the results
+        return
+
+    if usernames := _usernames_to_resolve(batch):
+        mojang.resolve_uuids(usernames)
+
+
+def _usernames_to_resolve(heads: Iterable[HeadSpec]) -> list[str]:
+    """Get the usernames of any players whose textures will need to be fetched
+    in order to render the specified heads"""
+    return [
+        head.player_name for head in heads if head.player_name and head.texture is None
+    ]
 
 
 def _function_dir() -> Path: